@@ -2,26 +2,28 @@
 import os
 import sys
 import subprocess
+import importlib.util
 import time
 from datetime import datetime
 
-# Install required packages
-print("=" * 70)
-print("INSTALLING REQUIREMENTS...")
-print("=" * 70)
-
-required_packages = [
-    'opencv-contrib-python', 'numpy', 'albumentations', 
-    'scikit-learn', 'matplotlib', 'tqdm', 'pyyaml', 'ultralytics'
-]
-
-for package in required_packages:
-    try:
-        __import__(package.replace('-', '_'))
-        print(f"✓ {package}")
-    except ImportError:
-        print(f"Installing {package}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package, "-q"])
+# Install missing requirements (pip package -> import name)
+PKG_TO_MODULE = {
+    'opencv-contrib-python': 'cv2',
+    'numpy': 'numpy',
+    'albumentations': 'albumentations',
+    'scikit-learn': 'sklearn',
+    'matplotlib': 'matplotlib',
+    'tqdm': 'tqdm',
+    'pyyaml': 'yaml',
+    'ultralytics': 'ultralytics',
+}
+
+missing = [pkg for pkg, mod in PKG_TO_MODULE.items() if importlib.util.find_spec(mod) is None]
+if missing:
+    print("=" * 70)
+    print(f"INSTALLING REQUIREMENTS: {', '.join(missing)}")
+    print("=" * 70)
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "-q", *missing])
 
 # IMPORTS
 import os
@@ -37,6 +39,7 @@ matplotlib.use('Agg')
 import albumentations as A
 from tqdm import tqdm
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import (
@@ -44,6 +47,15 @@ from sklearn.metrics import (
     classification_report, confusion_matrix
 )
 from ultralytics import YOLO
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _tj = TurboJPEG()
+except Exception:  # package missing or libturbojpeg not found
+    _tj = None
 import yaml
 import torch
 
@@ -53,10 +65,12 @@ print("GPU CHECK")
 print("=" * 70)
 if torch.cuda.is_available():
     DEVICE = 0  # Use first GPU
+    HALF = True  # FP16 inference on GPU; CPU FP16 is slower than FP32
     print(f"✓ CUDA Available: {torch.cuda.get_device_name(0)}")
     print(f"  GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
 else:
     DEVICE = 'cpu'
+    HALF = False
     print("✗ No GPU detected, using CPU (training will be slow)")
 
 # CONFIGURATION
@@ -64,10 +78,7 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(SCRIPT_DIR, "Solar_panel_Images")
 BASE_OUTPUT = os.path.join(SCRIPT_DIR, "YOLO_RESULTS")
 
-# Create output directory
-os.makedirs(BASE_OUTPUT, exist_ok=True)
 RESULTS_DIR = os.path.join(BASE_OUTPUT, f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-os.makedirs(RESULTS_DIR, exist_ok=True)
 
 # Paths
 OUT_AUG = os.path.join(RESULTS_DIR, "solar_aug_full")
@@ -75,49 +86,229 @@ OUT_SPLIT = os.path.join(RESULTS_DIR, "solar_split_70_20_10")
 DET_ROOT = os.path.join(RESULTS_DIR, "solar_det")
 RUNS_DIR = os.path.join(RESULTS_DIR, "runs")
 
+VALID_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+# Evaluate an INT8-calibrated export (TensorRT on GPU, OpenVINO on CPU) instead of FP16/FP32.
+# Calibrates on the training split (passed explicitly: Ultralytics defaults to data.yaml's val split);
+# the test metrics then show the accuracy cost of quantizing.
+EXPORT_INT8 = False
+
+# Batch size of the streamed metrics pass; exports are built with a dynamic batch up to this
+EVAL_BATCH = 32
+
 # Helper functions
-def imread_rgb(path):
-    img = cv2.imread(path)
+def list_images(d):
+    return sorted(e.path for e in os.scandir(d)
+                  if e.is_file() and os.path.splitext(e.name)[1].lower() in VALID_SUFFIXES)
+
+def imread_small_rgb(path, target):
+    # libjpeg can scale during the IDCT; only fall back to a full decode if 1/4 scale undershoots target
+    img = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_4)
+    if img is not None and min(img.shape[:2]) < target:
+        img = cv2.imread(path)
     if img is None:
         return None
+    if img.shape[:2] != (target, target):
+        img = cv2.resize(img, (target, target), interpolation=cv2.INTER_AREA)
     return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
-def save_rgb(path, img_rgb):
-    cv2.imwrite(path, cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR))
-
-def unique_name(out_dir, filename):
-    name = filename
-    k = 1
-    while os.path.exists(os.path.join(out_dir, name)):
-        name = f"{os.path.splitext(filename)[0]}_{k}.jpg"
-        k += 1
-    return name
+def is_readable(path):
+    # 1/8-scale decode still walks the whole stream but skips most of the IDCT work
+    return cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_8) is not None
+
+def save_rgb(path, img_rgb, quality=90):
+    bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+    if _tj is not None:
+        with open(path, "wb") as f:
+            f.write(_tj.encode(bgr, quality=quality, jpeg_subsample=TJSAMP_420))
+        return
+    cv2.imwrite(path, bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+
+class DirNamer:
+    """Hands out unused file names in a directory without a stat call per attempt."""
+
+    def __init__(self, out_dir):
+        self.used = set(os.listdir(out_dir))
+
+    def take(self, filename):
+        name = filename
+        k = 1
+        while name in self.used:
+            name = f"{os.path.splitext(filename)[0]}_{k}.jpg"
+            k += 1
+        self.used.add(name)
+        return name
+
+def dhash_gray(img_rgb, hash_size=8):
+    g = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
+    return cv2.resize(g, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
 
 def dhash_64(img_rgb, hash_size=8):
-    g = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
-    g = cv2.resize(g, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
-    diff = g[:, 1:] > g[:, :-1]
-    bits = diff.flatten()
-    h = 0
-    for b in bits:
-        h = (h << 1) | int(b)
-    return h
+    g = dhash_gray(img_rgb, hash_size)
+    diff = (g[:, 1:] > g[:, :-1]).astype(np.uint8)
+    return int.from_bytes(np.packbits(diff.ravel()).tobytes(), 'big')
 
 def hamming(a, b):
     return (a ^ b).bit_count()
 
-def is_near_duplicate(h_new, hashes, threshold):
-    for h in hashes:
-        if hamming(h_new, h) <= threshold:
-            return True
-    return False
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def popcount64(x):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return _POPCOUNT8[x.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _dhash_match(g, seen, n, threshold):
+        # Same bit order as dhash_64, then an early-exit Hamming scan over seen[:n]
+        one = np.uint64(1)
+        h = np.uint64(0)
+        for r in range(g.shape[0]):
+            for c in range(g.shape[1] - 1):
+                h = h << one
+                if g[r, c + 1] > g[r, c]:
+                    h = h | one
+        for k in range(n):
+            x = h ^ seen[k]
+            bits = 0
+            while x:
+                x = x & (x - one)
+                bits += 1
+            if bits <= threshold:
+                return h, True
+        return h, False
+else:
+    _dhash_match = None
+
+class HashIndex:
+    """Contiguous uint64 buffer of seen hashes, scanned with vectorized XOR + popcount."""
+
+    def __init__(self, capacity=1024):
+        self.buf = np.empty(capacity, dtype=np.uint64)
+        self.n = 0
+
+    def add(self, h):
+        if self.n == len(self.buf):
+            grown = np.empty(len(self.buf) * 2, dtype=np.uint64)
+            grown[:self.n] = self.buf[:self.n]
+            self.buf = grown
+        self.buf[self.n] = h
+        self.n += 1
+
+    def query(self, h, threshold):
+        """Return True if any stored hash is within `threshold` bits of `h`."""
+        if self.n == 0:
+            return False
+        dists = popcount64(np.bitwise_xor(self.buf[:self.n], np.uint64(h)))
+        return bool((dists <= threshold).any())
+
+    def match_image(self, img_rgb, threshold):
+        """dHash `img_rgb` and check it against the index; returns (hash, is_near_duplicate)."""
+        g = dhash_gray(img_rgb)
+        if _dhash_match is not None:
+            h, dup = _dhash_match(g, self.buf, self.n, threshold)
+            return int(h), bool(dup)
+        diff = (g[:, 1:] > g[:, :-1]).astype(np.uint8)
+        h = int.from_bytes(np.packbits(diff.ravel()).tobytes(), 'big')
+        return h, self.query(h, threshold)
+
+
+def link_or_copy(src, dst):
+    # Hard link shares the file content; fall back to a copy across filesystems or without link support
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
-def copy_many(paths, dest_dir):
+def link_many(paths, dest_dir):
     for p in paths:
-        shutil.copy2(p, os.path.join(dest_dir, os.path.basename(p)))
+        link_or_copy(p, os.path.join(dest_dir, os.path.basename(p)))
+
+def build_augmenter(img_size):
+    return A.Compose([
+        A.RandomResizedCrop(size=(img_size, img_size), scale=(0.80, 1.0), ratio=(0.90, 1.10), p=1.0),
+        A.OneOf([
+            A.Rotate(limit=20, border_mode=cv2.BORDER_REFLECT_101, p=1.0),
+            A.Affine(rotate=(-20, 20), translate_percent=(0.0, 0.06), scale=(0.9, 1.1), shear=(-6, 6), p=1.0),
+        ], p=0.8),
+        A.HorizontalFlip(p=0.5),
+        A.VerticalFlip(p=0.15),
+        A.RandomBrightnessContrast(p=0.6),
+        A.OneOf([A.GaussianBlur(blur_limit=(3,7), p=1.0), A.MotionBlur(blur_limit=(3,7), p=1.0)], p=0.25),
+        A.GaussNoise(std_range=(0.01, 0.05), p=0.3),
+    ], p=1.0, is_check_shapes=False)  # single image target, nothing to cross-check
+
+def augment_class(c, in_dir, out_dir, target, thresh, img_size, position=0):
+    """Dedup and augment one class folder; returns its augmentation-mapping CSV rows."""
+    cv2.setNumThreads(1)  # one class per process, avoid oversubscribing cores
+    random.seed()  # forked workers would otherwise share the parent's RNG state
+    aug = build_augmenter(img_size)
+    os.makedirs(out_dir, exist_ok=True)
+    namer = DirNamer(out_dir)
+    rows = []
+
+    originals = list_images(in_dir)
+    if len(originals) == 0:
+        print(f"[{c}] no images")
+        return rows
+
+    if len(originals) > target:
+        originals = random.sample(originals, target)
+
+    seen = HashIndex()
+    cache = []  # decoded, resized originals reused by the augmentation loop
+
+    for p in originals:
+        im = imread_small_rgb(p, img_size)
+        if im is None: 
+            continue
+        cache.append((p, im))
+        h, dup = seen.match_image(im, thresh)
+        if dup:
+            continue
+        seen.add(h)
+        dst = namer.take(os.path.basename(p))
+        dst_path = os.path.join(out_dir, dst)
+        shutil.copy2(p, dst_path)
+        rows.append([c, p, dst_path])
+
+    cur = len(list_images(out_dir))
+    need = max(0, target - cur)
+    print(f"[{c}] kept originals={cur}, need_aug={need}")
+    if not cache:
+        return rows
+
+    # Augment until target
+    i, tries = 0, 0
+    # Own line per worker so concurrent classes don't overwrite each other's bar
+    pbar = tqdm(total=need, desc=f"Augmenting {c}", position=position, leave=True)
+    while i < need:
+        tries += 1
+        src, im = cache[random.randrange(len(cache))]
+        out = aug(image=im)["image"]
+        if out.shape[:2] != (img_size, img_size):
+            out = cv2.resize(out, (img_size, img_size))
+        h, dup = seen.match_image(out, thresh)
+        if dup:
+            if tries > 50000:
+                print(f"[{c}] too many near duplicates.")
+                break
+            continue
+        seen.add(h)
+        base = os.path.splitext(os.path.basename(src))[0]
+        fname = namer.take(f"{base}_aug_{i:05d}.jpg")
+        gen_path = os.path.join(out_dir, fname)
+        save_rgb(gen_path, out)
+        rows.append([c, src, gen_path])
+        i += 1
+        pbar.update(1)
+    pbar.close()
+    return rows
 
 
 def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
     print(f"\n Results saved to: {RESULTS_DIR}\n")
 
     # COLLECT IMAGES AND LABELS
@@ -125,7 +316,6 @@ def main():
     print("COLLECTING IMAGES AND LABELS")
     print("=" * 70)
 
-    valid_ext = (".jpg", ".jpeg", ".png", ".bmp", ".JPG", ".JPEG", ".PNG")
     exclude_folder = "Bird-drop"
 
     image_paths = []
@@ -136,7 +326,7 @@ def main():
         if not os.path.isdir(folder) or label == exclude_folder:
             continue
         
-        files = [f for f in glob.glob(os.path.join(folder, "*")) if f.endswith(valid_ext)]
+        files = list_images(folder)
         image_paths.extend(files)
         labels.extend([label] * len(files))
         print(f"  {label}: {len(files)} images")
@@ -159,11 +349,10 @@ def main():
     else:
         print(" Image-label mismatch!")
 
-    bad_images = []
     print("Scanning for corrupted images...")
-    for img in tqdm(image_paths):
-        if cv2.imread(img) is None:
-            bad_images.append(img)
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        readable = list(tqdm(ex.map(is_readable, image_paths), total=len(image_paths)))
+    bad_images = [p for p, ok in zip(image_paths, readable) if not ok]
 
     if len(bad_images) == 0:
         print(" All images are readable")
@@ -196,19 +385,6 @@ def main():
     TARGET_PER_CLASS = 500
     NEAR_DUP_THRESHOLD = 6
 
-    aug = A.Compose([
-        A.RandomResizedCrop(size=(IMG_SIZE, IMG_SIZE), scale=(0.80, 1.0), ratio=(0.90, 1.10), p=1.0),
-        A.OneOf([
-            A.Rotate(limit=20, border_mode=cv2.BORDER_REFLECT_101, p=1.0),
-            A.Affine(rotate=(-20, 20), translate_percent=(0.0, 0.06), scale=(0.9, 1.1), shear=(-6, 6), p=1.0),
-        ], p=0.8),
-        A.HorizontalFlip(p=0.5),
-        A.VerticalFlip(p=0.15),
-        A.RandomBrightnessContrast(p=0.6),
-        A.OneOf([A.GaussianBlur(blur_limit=(3,7), p=1.0), A.MotionBlur(blur_limit=(3,7), p=1.0)], p=0.25),
-        A.GaussNoise(std_range=(0.01, 0.05), p=0.3),
-    ], p=1.0)
-
     if os.path.exists(OUT_AUG):
         shutil.rmtree(OUT_AUG)
     os.makedirs(OUT_AUG, exist_ok=True)
@@ -220,67 +396,16 @@ def main():
         writer = csv.writer(f)
         writer.writerow(["class", "original_path", "generated_path"])
         
-        for c in classes:
-            in_dir = os.path.join(DATASET_PATH, c)
-            out_dir = os.path.join(OUT_AUG, c)
-            os.makedirs(out_dir, exist_ok=True)
-
-            originals = sorted([p for p in glob.glob(os.path.join(in_dir, "*")) if p.endswith(valid_ext)])
-            if len(originals) == 0:
-                print(f"[{c}] no images")
-                continue
-
-            if len(originals) > TARGET_PER_CLASS:
-                originals = random.sample(originals, TARGET_PER_CLASS)
-
-            seen_hashes = []
-
-            for p in originals:
-                im = imread_rgb(p)
-                if im is None: 
-                    continue
-                if im.shape[:2] != (IMG_SIZE, IMG_SIZE):
-                    im = cv2.resize(im, (IMG_SIZE, IMG_SIZE))
-                h = dhash_64(im)
-                if is_near_duplicate(h, seen_hashes, NEAR_DUP_THRESHOLD):
-                    continue
-                seen_hashes.append(h)
-                dst = unique_name(out_dir, os.path.basename(p))
-                dst_path = os.path.join(out_dir, dst)
-                shutil.copy2(p, dst_path)
-                writer.writerow([c, p, dst_path])
-
-            cur = len([f for f in glob.glob(os.path.join(out_dir, "*")) if f.endswith(valid_ext)])
-            need = max(0, TARGET_PER_CLASS - cur)
-            print(f"[{c}] kept originals={cur}, need_aug={need}")
-
-            # Augment until target
-            i, tries = 0, 0
-            pbar = tqdm(total=need, desc=f"Augmenting {c}")
-            while i < need:
-                tries += 1
-                src = random.choice(originals)
-                im = imread_rgb(src)
-                if im is None: 
-                    continue
-                out = aug(image=im)["image"]
-                if out.shape[:2] != (IMG_SIZE, IMG_SIZE):
-                    out = cv2.resize(out, (IMG_SIZE, IMG_SIZE))
-                h = dhash_64(out)
-                if is_near_duplicate(h, seen_hashes, NEAR_DUP_THRESHOLD):
-                    if tries > 50000:
-                        print(f"[{c}] too many near duplicates.")
-                        break
-                    continue
-                seen_hashes.append(h)
-                base = os.path.splitext(os.path.basename(src))[0]
-                fname = unique_name(out_dir, f"{base}_aug_{i:05d}.jpg")
-                gen_path = os.path.join(out_dir, fname)
-                save_rgb(gen_path, out)
-                writer.writerow([c, src, gen_path])
-                i += 1
-                pbar.update(1)
-            pbar.close()
+        workers = max(1, min(len(classes), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [
+                ex.submit(augment_class, c, os.path.join(DATASET_PATH, c), os.path.join(OUT_AUG, c),
+                          TARGET_PER_CLASS, NEAR_DUP_THRESHOLD, IMG_SIZE, position=i)
+                for i, c in enumerate(classes)
+            ]
+            # Collected in class order, so the mapping CSV is the same from run to run
+            for fut in futures:
+                writer.writerows(fut.result())
 
     print(f"\n Augmented dataset saved in: {OUT_AUG}")
 
@@ -304,7 +429,7 @@ def main():
 
     for c in classes:
         src_dir = os.path.join(OUT_AUG, c)
-        imgs = sorted([p for p in glob.glob(os.path.join(src_dir, "*")) if p.endswith(valid_ext)])
+        imgs = list_images(src_dir)
 
         train_val, test = train_test_split(imgs, test_size=0.10, random_state=42, shuffle=True)
         train, val = train_test_split(train_val, test_size=0.2222, random_state=42, shuffle=True)
@@ -313,9 +438,9 @@ def main():
         os.makedirs(os.path.join(val_root, c), exist_ok=True)
         os.makedirs(os.path.join(test_root, c), exist_ok=True)
         
-        copy_many(train, os.path.join(train_root, c))
-        copy_many(val, os.path.join(val_root, c))
-        copy_many(test, os.path.join(test_root, c))
+        link_many(train, os.path.join(train_root, c))
+        link_many(val, os.path.join(val_root, c))
+        link_many(test, os.path.join(test_root, c))
 
     print(f" Dataset split completed: {OUT_SPLIT}")
 
@@ -333,19 +458,26 @@ def main():
     name_to_id = {name:i for i,name in enumerate(NAMES)}
     FULL_BOX = "{cls} 0.5 0.5 1.0 1.0\n"
 
+    # Every label in a class is identical, so write it once and hard-link it per image
+    proto_dir = os.path.join(DET_ROOT, "label_protos")
+    os.makedirs(proto_dir, exist_ok=True)
+    protos = {}
+    for cls, cls_id in name_to_id.items():
+        protos[cls] = os.path.join(proto_dir, f"{cls_id}.txt")
+        with open(protos[cls], "w") as f:
+            f.write(FULL_BOX.format(cls=cls_id))
+
     for split in ["train","val","test"]:
         for cls in NAMES:
             src_cls_dir = os.path.join(OUT_SPLIT, split, cls)
-            imgs = sorted([p for p in glob.glob(os.path.join(src_cls_dir,"*")) if p.endswith(valid_ext)])
-            cls_id = name_to_id[cls]
+            imgs = list_images(src_cls_dir)
             for img_path in imgs:
                 base = os.path.splitext(os.path.basename(img_path))[0]
                 out_img_name = f"{cls}_{base}.jpg"
                 out_img_path = os.path.join(DET_ROOT,"images",split,out_img_name)
                 out_lbl_path = os.path.join(DET_ROOT,"labels",split,f"{cls}_{base}.txt")
-                shutil.copy2(img_path, out_img_path)
-                with open(out_lbl_path,"w") as f:
-                    f.write(FULL_BOX.format(cls=cls_id))
+                link_or_copy(img_path, out_img_path)
+                link_or_copy(protos[cls], out_lbl_path)
 
     data = {
         "path": DET_ROOT,
@@ -386,10 +518,42 @@ def main():
     # Find model
     best_model_path = os.path.join(RUNS_DIR, "detect_train", "weights", "best.pt")
     det = YOLO(best_model_path)
+    det_path = best_model_path
+
+    # TensorRT engine for the fixed 640x640 eval passes; keep the .pt model if export isn't possible
+    if DEVICE != 'cpu':
+        try:
+            if EXPORT_INT8:
+                engine_path = det.export(format="engine", int8=True, data=yaml_path, split="train",
+                                         dynamic=True, batch=EVAL_BATCH, imgsz=640, device=DEVICE)
+            else:
+                engine_path = det.export(format="engine", half=True, dynamic=True, batch=EVAL_BATCH,
+                                         imgsz=640, device=DEVICE)
+            det, det_path = YOLO(engine_path, task="detect"), engine_path
+            print(f" Using TensorRT engine: {engine_path}")
+        except Exception as e:
+            print(f" TensorRT export failed ({e}), evaluating with {best_model_path}")
+    elif EXPORT_INT8:
+        # OpenVINO runs the calibrated model on the CPU's int8 (VNNI) kernels
+        try:
+            ov_path = det.export(format="openvino", int8=True, data=yaml_path, split="train",
+                                 dynamic=True, batch=EVAL_BATCH, imgsz=640)
+            det, det_path = YOLO(ov_path, task="detect"), ov_path
+            print(f" Using OpenVINO INT8 model: {ov_path}")
+        except Exception as e:
+            print(f" OpenVINO INT8 export failed ({e}), evaluating with {best_model_path}")
+    else:
+        # ONNX Runtime's fused graph beats eager PyTorch on CPU; dynamic axes keep batch=32 predict working
+        try:
+            onnx_path = det.export(format="onnx", simplify=True, dynamic=True, imgsz=640)
+            det, det_path = YOLO(onnx_path, task="detect"), onnx_path
+            print(f" Using ONNX model: {onnx_path}")
+        except Exception as e:
+            print(f" ONNX export failed ({e}), evaluating with {best_model_path}")
 
     # Validation metrics
     print("\nCalculating metrics...")
-    metrics = det.val(data=yaml_path, split="test", device=DEVICE)
+    metrics = det.val(data=yaml_path, split="test", device=DEVICE, half=HALF)
 
     print(f"mAP50-95: {metrics.box.map:.4f}")
     print(f"mAP50: {metrics.box.map50:.4f}")
@@ -404,23 +568,20 @@ def main():
     sample = random.sample(test_imgs, min(9, len(test_imgs)))
 
     print(f"Visualizing {len(sample)} test predictions...")
-    fig, axes = plt.subplots(3, 3, figsize=(15, 15))
-    axes = axes.flatten()
+    CELL = 512
+    cells = []
+    viz_results = det.predict(sample, conf=0.25, verbose=False, device=DEVICE, half=HALF) if sample else []
+    for result, img_path in zip(viz_results, sample):
+        cell = cv2.resize(result.plot(), (CELL, CELL))
+        cv2.putText(cell, os.path.basename(img_path)[:20], (8, 24),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+        cells.append(cell)
+    cells += [np.zeros((CELL, CELL, 3), np.uint8)] * (9 - len(cells))
+    mosaic = cv2.vconcat([cv2.hconcat(cells[i:i + 3]) for i in (0, 3, 6)])
 
-    for idx, img_path in enumerate(sample):
-        result = det.predict(img_path, conf=0.25, verbose=False, device=DEVICE)[0]
-        img_bgr = result.plot()
-        img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-        
-        axes[idx].imshow(img_rgb)
-        axes[idx].set_title(os.path.basename(img_path)[:20])
-        axes[idx].axis('off')
-
-    plt.tight_layout()
     viz_path = os.path.join(RESULTS_DIR, "predictions_visualization.png")
-    plt.savefig(viz_path, dpi=150, bbox_inches='tight')
+    cv2.imwrite(viz_path, mosaic)
     print(f" Saved: {viz_path}")
-    plt.close()
 
     # COMPUTE PERFORMANCE METRICS
     print("\n" + "=" * 70)
@@ -433,9 +594,9 @@ def main():
     NO_DET_ID = -1
     CONF_THRES = 0.25
 
-    y_true, y_pred = [], []
-
-    for img_path in tqdm(val_image_paths):
+    # Ground-truth class per image, read once up front
+    gt_by_path = {}
+    for img_path in val_image_paths:
         stem = os.path.splitext(os.path.basename(img_path))[0]
         label_path = os.path.join(labels_val_dir, stem + ".txt")
 
@@ -447,19 +608,33 @@ def main():
         if not lines:
             continue
 
-        gt_cls_id = int(lines[0].split()[0])
-        res = det.predict(img_path, imgsz=640, conf=CONF_THRES, verbose=False, device=DEVICE)[0]
+        gt_by_path[img_path] = int(lines[0].split()[0])
 
-        if res.boxes is None or len(res.boxes) == 0:
-            pred_cls_id = NO_DET_ID
-        else:
-            best_idx = int(res.boxes.conf.argmax().item())
-            pred_cls_id = int(res.boxes.cls[best_idx].item())
+    eval_paths = list(gt_by_path)
 
-        y_true.append(gt_cls_id)
-        y_pred.append(pred_cls_id)
+    def predict_classes(model):
+        preds = []
+        results_iter = model.predict(
+            source=eval_paths, stream=True, batch=EVAL_BATCH, imgsz=640,
+            conf=CONF_THRES, verbose=False, device=DEVICE, half=HALF
+        )
+        for res in tqdm(results_iter, total=len(eval_paths)):
+            if res.boxes is None or len(res.boxes) == 0:
+                preds.append(NO_DET_ID)
+            else:
+                best_idx = int(res.boxes.conf.argmax().item())
+                preds.append(int(res.boxes.cls[best_idx].item()))
+        return preds
 
-    y_true = np.array(y_true, dtype=int)
+    try:
+        y_pred = predict_classes(det)
+    except Exception as e:
+        # An exported backend that can't take this batch (or fails at runtime) shouldn't lose the run
+        if det_path == best_model_path:
+            raise
+        print(f" Predict with {det_path} failed ({e}), re-running with {best_model_path}")
+        y_pred = predict_classes(YOLO(best_model_path))
+    y_true = np.array([gt_by_path[p] for p in eval_paths], dtype=int)
     y_pred = np.array(y_pred, dtype=int)
 
     print(f"\n Evaluated {len(y_true)} test images")
@@ -518,11 +693,11 @@ def main():
 
     # Add text annotations
     thresh = cm.max() / 2.
-    for i in range(cm.shape[0]):
-        for j in range(cm.shape[1]):
-            ax.text(j, i, format(cm[i, j], 'd'),
-                    ha="center", va="center",
-                    color="white" if cm[i, j] > thresh else "black")
+    cell_text = np.char.mod('%d', cm).ravel()
+    cell_color = np.where(cm > thresh, "white", "black").ravel()
+    rows, cols = np.indices(cm.shape)
+    for i, j, txt, color in zip(rows.ravel(), cols.ravel(), cell_text, cell_color):
+        ax.text(j, i, txt, ha="center", va="center", color=color)
 
     plt.title("Confusion Matrix - YOLOv8 Detection", fontsize=14, fontweight='bold')
     plt.tight_layout()
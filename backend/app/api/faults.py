@@ -1,6 +1,6 @@
 import uuid
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.db.deps import get_db
 from app.models.fault import Fault
@@ -21,9 +21,13 @@ def create_fault(payload: FaultCreate, db: Session = Depends(get_db)):
 @router.get("", response_model=list[FaultOut])
 def list_faults(
     panel_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
     db: Session = Depends(get_db),
 ):
-    q = db.query(Fault)
+    q = db.query(Fault).options(raiseload("*"))
     if panel_id:
         q = q.filter(Fault.panel_id == panel_id)
-    return q.order_by(Fault.detected_at.desc()).all()
+    rows = q.order_by(Fault.detected_at.desc()).offset(offset).limit(limit).all()
+    # Rows come straight from the DB, so build the schemas without re-validating each one
+    return [FaultOut.from_row(f) for f in rows]
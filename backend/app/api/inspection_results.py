@@ -1,6 +1,6 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, raiseload
 
 from app.db.deps import get_db
 from app.models.inspection_result import InspectionResult
@@ -29,19 +29,27 @@ def create_inspection_result(payload: InspectionResultCreate, db: Session = Depe
 
 
 @router.get("", response_model=list[InspectionResultOut])
-def list_inspection_results(db: Session = Depends(get_db), limit: int = 100, offset: int = 0):
-    return (
-        db.query(InspectionResult)
-        .order_by(InspectionResult.inspected_at.desc())
+def list_inspection_results(
+    db: Session = Depends(get_db),
+    mission_image_id: uuid.UUID | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+):
+    q = db.query(InspectionResult).options(raiseload("*"))
+    if mission_image_id:
+        q = q.filter(InspectionResult.mission_image_id == mission_image_id)
+    rows = (
+        q.order_by(InspectionResult.inspected_at.desc())
         .offset(offset)
         .limit(limit)
         .all()
     )
+    return [InspectionResultOut.from_row(r) for r in rows]
 
 
 @router.get("/{inspection_id}", response_model=InspectionResultOut)
 def get_inspection_result(inspection_id: uuid.UUID, db: Session = Depends(get_db)):
-    row = db.query(InspectionResult).filter(InspectionResult.id == inspection_id).first()
+    row = db.get(InspectionResult, inspection_id)
     if not row:
         raise HTTPException(status_code=404, detail="Inspection result not found")
     return row
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.db.deps import get_db
 from app.models.mission import Mission
@@ -27,20 +27,23 @@ def list_missions(
     db: Session = Depends(get_db),
     status: MissionStatus | None = Query(default=None),
     panel_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
 ):
-    q = db.query(Mission)
+    q = db.query(Mission).options(raiseload("*"))
 
     if status:
         q = q.filter(Mission.status == status)
     if panel_id:
         q = q.filter(Mission.panel_id == panel_id)
 
-    return q.order_by(Mission.created_at.desc()).all()
+    rows = q.order_by(Mission.created_at.desc()).offset(offset).limit(limit).all()
+    return [MissionOut.from_row(m) for m in rows]
 
 
 @router.get("/{mission_id}", response_model=MissionOut)
 def get_mission(mission_id: uuid.UUID, db: Session = Depends(get_db)):
-    mission = db.query(Mission).filter(Mission.id == mission_id).first()
+    mission = db.get(Mission, mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="Mission not found")
     return mission
@@ -52,7 +55,7 @@ def approve_mission(
     approved_by_user_id: uuid.UUID = Query(...),  # replace with auth later
     db: Session = Depends(get_db),
 ):
-    mission = db.query(Mission).filter(Mission.id == mission_id).first()
+    mission = db.get(Mission, mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="Mission not found")
 
@@ -60,7 +63,6 @@ def approve_mission(
     mission.approved_by_user_id = approved_by_user_id
     mission.approved_at = datetime.now(timezone.utc)
 
-    db.add(mission)
     db.commit()
     db.refresh(mission)
     return mission
\ No newline at end of file
@@ -1,21 +1,42 @@
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
 
+from app.db.bulk import require_insert_sentinel
 from app.db.deps import get_db
 from app.models.mission import Mission
 from app.models.mission_images import MissionImage
-from app.schemas.mission_images import MissionImageCreate, MissionImageOut
+from app.schemas.mission_images import MissionImageBulkCreate, MissionImageCreate, MissionImageOut
 
 router = APIRouter(prefix="/api/v1/mission-images", tags=["Mission Images"])
 
+# The MissionImageOut fields, selected as plain columns for the listing
+IMAGE_COLUMNS = (
+    MissionImage.id,
+    MissionImage.mission_id,
+    MissionImage.storage_key,
+    MissionImage.content_type,
+    MissionImage.width,
+    MissionImage.height,
+    MissionImage.uploaded_at,
+)
+
+# Rows come back in payload order so clients can match images to ids by position;
+# the id sentinel keeps that one batched INSERT rather than a round trip per image
+_BULK_INSERT = require_insert_sentinel(
+    insert(MissionImage).returning(*IMAGE_COLUMNS, sort_by_parameter_order=True),
+    *MissionImageCreate.model_fields,
+)
+
 
 @router.post("", response_model=MissionImageOut)
 def create_mission_image(payload: MissionImageCreate, db: Session = Depends(get_db)):
-    # Ensure mission exists
-    mission = db.query(Mission).filter(Mission.id == payload.mission_id).first()
-    if not mission:
+    # Ensure mission exists (fetch only the key, no Mission instance)
+    exists = db.execute(select(Mission.id).where(Mission.id == payload.mission_id)).scalar()
+    if not exists:
         raise HTTPException(status_code=404, detail="Mission not found")
 
     img = MissionImage(**payload.model_dump())
@@ -25,15 +46,44 @@ def create_mission_image(payload: MissionImageCreate, db: Session = Depends(get_
     return img
 
 
+@router.post("/bulk", response_model=list[MissionImageOut])
+def create_mission_images_bulk(payload: MissionImageBulkCreate, db: Session = Depends(get_db)):
+    if not payload:
+        return []
+
+    # Ensure every referenced mission exists, in one query
+    mission_ids = {p.mission_id for p in payload}
+    found = set(db.execute(select(Mission.id).where(Mission.id.in_(mission_ids))).scalars())
+    if found != mission_ids:
+        raise HTTPException(status_code=404, detail="Mission not found")
+
+    # One executemany INSERT ... RETURNING instead of an add/flush per image; plain rows,
+    # so the commit has no instances to expire and reload one SELECT at a time
+    imgs = db.execute(_BULK_INSERT, [p.model_dump() for p in payload]).mappings().all()
+    db.commit()
+    return imgs
+
+
 @router.get("", response_model=list[MissionImageOut])
 def list_mission_images(
     db: Session = Depends(get_db),
     mission_id: uuid.UUID | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+    before_ts: datetime | None = Query(default=None, description="uploaded_at of the last image received"),
+    before_id: uuid.UUID | None = Query(default=None, description="id of the last image received"),
 ):
-    q = db.query(MissionImage)
+    # Keyset pagination on (uploaded_at, id): images from one bulk upload share uploaded_at,
+    # so the id is needed to resume inside such a group without skipping rows
+    stmt = select(*IMAGE_COLUMNS)
     if mission_id:
-        q = q.filter(MissionImage.mission_id == mission_id)
-    return q.order_by(MissionImage.uploaded_at.desc()).all()
+        stmt = stmt.where(MissionImage.mission_id == mission_id)
+    if before_ts and before_id:
+        stmt = stmt.where(tuple_(MissionImage.uploaded_at, MissionImage.id) < tuple_(before_ts, before_id))
+    elif before_ts:
+        stmt = stmt.where(MissionImage.uploaded_at < before_ts)
+    stmt = stmt.order_by(MissionImage.uploaded_at.desc(), MissionImage.id.desc()).limit(limit)
+    rows = db.execute(stmt)
+    return [MissionImageOut.from_row(r) for r in rows]
 
 
 @router.get("/{image_id}", response_model=MissionImageOut)
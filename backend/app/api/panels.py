@@ -1,13 +1,22 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.deps import get_db
 from app.models.panel import Panel
 from app.schemas.panel import PanelCreate, PanelOut
+from app.services.list_cache import ListCache
 
 router = APIRouter(prefix="/api/v1/panels", tags=["Panels"])
 
+_PANELS_CACHE = ListCache(maxsize=64, ttl=30)
+_PANELS_ADAPTER = TypeAdapter(list[PanelOut])
+
+# The PanelOut fields; the listing reads plain rows and never builds Panel instances
+PANEL_COLUMNS = (Panel.id, Panel.site_id, Panel.label, Panel.serial_number, Panel.status)
+
 
 @router.post("", response_model=PanelOut)
 def create_panel(payload: PanelCreate, db: Session = Depends(get_db)):
@@ -20,18 +29,33 @@ def create_panel(payload: PanelCreate, db: Session = Depends(get_db)):
     db.add(panel)
     db.commit()
     db.refresh(panel)
+    _PANELS_CACHE.clear()
     return panel
 
 
 @router.get("", response_model=list[PanelOut])
 def list_panels(
+    request: Request,
     site_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    before_id: uuid.UUID | None = Query(default=None),
     db: Session = Depends(get_db),
 ):
-    q = db.query(Panel)
+    key = (site_id, limit, before_id)
+    entry = _PANELS_CACHE.get(key)
+    if entry is not None:
+        return entry.response(request)
+
+    version = _PANELS_CACHE.version
+    # Keyset pagination: pass the id of the last panel received as before_id
+    stmt = select(*PANEL_COLUMNS)
     if site_id:
-        q = q.filter(Panel.site_id == site_id)
-    return q.order_by(Panel.id.desc()).all()
+        stmt = stmt.where(Panel.site_id == site_id)
+    if before_id:
+        stmt = stmt.where(Panel.id < before_id)
+    rows = db.execute(stmt.order_by(Panel.id.desc()).limit(limit))
+    panels = [PanelOut.from_row(r) for r in rows]
+    return _PANELS_CACHE.put(key, _PANELS_ADAPTER.dump_json(panels), version).response(request)
 
 
 @router.get("/{panel_id}", response_model=PanelOut)
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db.deps import get_db
 from app.models.site import Site
 from app.schemas.site import SiteCreate, SiteOut
+from app.services.list_cache import ListCache
 
 router = APIRouter(prefix="/api/v1/sites", tags=["Sites"])
 
+_SITES_CACHE = ListCache(maxsize=8, ttl=30)
+_SITES_ADAPTER = TypeAdapter(list[SiteOut])
+_LIST_SITES = select(Site.id, Site.name, Site.location_lat, Site.location_lng)
+
 @router.post("", response_model=SiteOut)
 def create_site(payload: SiteCreate, db: Session = Depends(get_db)):
     site = Site(**payload.model_dump())
     db.add(site)
     db.commit()
     db.refresh(site)
+    _SITES_CACHE.clear()
     return site
 
 @router.get("", response_model=list[SiteOut])
-def list_sites(db: Session = Depends(get_db)):
-    return db.query(Site).all()
+def list_sites(request: Request, db: Session = Depends(get_db)):
+    entry = _SITES_CACHE.get("all")
+    if entry is None:
+        version = _SITES_CACHE.version
+        sites = [SiteOut.from_row(r) for r in db.execute(_LIST_SITES)]
+        entry = _SITES_CACHE.put("all", _SITES_ADAPTER.dump_json(sites), version)
+    return entry.response(request)
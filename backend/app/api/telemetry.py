@@ -1,80 +1,147 @@
+import asyncio
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import DateTime, bindparam, func, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.deps import get_db
+from app.db.bulk import require_insert_sentinel
+from app.db.deps import get_async_db, get_db
 from app.models.telemetry import Telemetry
-from app.schemas.telemetry import TelemetryCreate, TelemetryOut
-from app.services.model_service import model_service
+from app.schemas.telemetry import TelemetryBulkCreate, TelemetryCreate, TelemetryOut
+from app.services.model_service import model_service, telemetry_array
 
 router = APIRouter(prefix="/api/v1/telemetry", tags=["Telemetry"])
 
+# Plain column tuples for the ML endpoints; they never need mapped Telemetry instances
+MODEL_COLUMNS = (
+    Telemetry.voltage, Telemetry.current, Telemetry.temperature, Telemetry.power, Telemetry.timestamp
+)
+
+# Exactly the TelemetryOut fields, for the list endpoint
+LIST_COLUMNS = (
+    Telemetry.id, Telemetry.panel_id,
+    Telemetry.voltage, Telemetry.current, Telemetry.temperature, Telemetry.timestamp,
+)
+
+MIN_RECORDS = 20
+
+# Built once at import; only the bound values change per request
+_ANOMALY_WINDOW = (
+    Telemetry.panel_id == bindparam("panel_id"),
+    Telemetry.timestamp >= bindparam("since"),
+)
+_ANOMALY_STMT = select(*MODEL_COLUMNS).where(*_ANOMALY_WINDOW).order_by(Telemetry.timestamp.asc())
+
+
+# Readings keep their buffered timestamp; ones sent without it get the server's now().
+# Ids come back in payload order so clients can match them up by position; the id sentinel
+# keeps that a batched multi-row INSERT rather than one round trip per reading
+_BULK_INSERT = require_insert_sentinel(
+    insert(Telemetry)
+    .values(timestamp=func.coalesce(bindparam("reading_ts", type_=DateTime(timezone=True)), func.now()))
+    .returning(Telemetry.id, sort_by_parameter_order=True),
+    "panel_id", "voltage", "current", "temperature", "reading_ts",
+)
+
+
+async def _count_upto(db: AsyncSession, *criteria, params: dict | None = None, cap: int = MIN_RECORDS) -> int:
+    """Count matching telemetry rows, stopping after cap (a short index probe, no sort)"""
+    probe = select(literal(1)).select_from(Telemetry).where(*criteria).limit(cap).subquery()
+    result = await db.execute(select(func.count()).select_from(probe), params)
+    return result.scalar_one()
+
 
 @router.post("", response_model=TelemetryOut)
 def create_telemetry(payload: TelemetryCreate, db: Session = Depends(get_db)):
     """Create new telemetry record from Arduino/sensor"""
-    telemetry = Telemetry(**payload.model_dump())
+    telemetry = Telemetry(**payload.model_dump(exclude_none=True))
     db.add(telemetry)
     db.commit()
     db.refresh(telemetry)
     return telemetry
 
 
+@router.post("/bulk", response_model=dict)
+def create_telemetry_bulk(payload: TelemetryBulkCreate, db: Session = Depends(get_db)):
+    """
+    Insert a batch of telemetry records in one statement and one commit.
+    Preferred over the single-record endpoint for sensors that buffer readings.
+    """
+    if not payload:
+        return {'inserted': 0, 'ids': []}
+    
+    ids = db.execute(
+        _BULK_INSERT,
+        [{**p.model_dump(exclude={'timestamp'}), 'reading_ts': p.timestamp} for p in payload],
+    ).scalars().all()
+    db.commit()
+    
+    return {'inserted': len(ids), 'ids': [str(i) for i in ids]}
+
+
 @router.get("", response_model=list[TelemetryOut])
 def list_telemetry(
     panel_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    before_ts: datetime | None = Query(default=None, description="timestamp of the last record received"),
+    before_id: uuid.UUID | None = Query(default=None, description="id of the last record received"),
     db: Session = Depends(get_db),
 ):
-    """Get all telemetry records, optionally filtered by panel_id"""
-    q = db.query(Telemetry)
+    """
+    Get telemetry records newest first, optionally filtered by panel_id.
+    To fetch the next page pass the last record's timestamp as before_ts and its id as before_id;
+    the id breaks ties between readings that share a timestamp (e.g. one bulk burst).
+    """
+    stmt = select(*LIST_COLUMNS)
     if panel_id:
-        q = q.filter(Telemetry.panel_id == panel_id)
-    return q.order_by(Telemetry.timestamp.desc()).all()
+        stmt = stmt.where(Telemetry.panel_id == panel_id)
+    if before_ts and before_id:
+        stmt = stmt.where(tuple_(Telemetry.timestamp, Telemetry.id) < tuple_(before_ts, before_id))
+    elif before_ts:
+        stmt = stmt.where(Telemetry.timestamp < before_ts)
+    stmt = stmt.order_by(Telemetry.timestamp.desc(), Telemetry.id.desc()).limit(limit)
+    rows = db.execute(stmt).mappings()
+    
+    # Column rows already have the TelemetryOut shape; orjson encodes them without a Pydantic pass
+    return ORJSONResponse([dict(r) for r in rows])
 
 
 @router.get("/predict", response_model=dict)
-def predict_power(
+async def predict_power(
     panel_id: uuid.UUID,
     limit: int = Query(default=100, ge=20, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Predict power output using LSTM model on recent telemetry data
     Requires at least 20 recent records from the specified panel
     """
+    # Reject sparse panels before paying for the sort + fetch
+    found = await _count_upto(db, Telemetry.panel_id == panel_id)
+    if found < MIN_RECORDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient data for prediction. Need at least 20 records, found {found}"
+        )
+    
     # Fetch recent telemetry data
-    records = (
-        db.query(Telemetry)
-        .filter(Telemetry.panel_id == panel_id)
+    result = await db.execute(
+        select(*MODEL_COLUMNS)
+        .where(Telemetry.panel_id == panel_id)
         .order_by(Telemetry.timestamp.desc())
         .limit(limit)
-        .all()
     )
-    
-    if len(records) < 20:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Insufficient data for prediction. Need at least 20 records, found {len(records)}"
-        )
+    records = result.all()
     
     # Reverse to chronological order
-    records = list(reversed(records))
-    
-    # Convert to dict format for model
-    telemetry_data = [
-        {
-            'voltage': r.voltage,
-            'current': r.current,
-            'temperature': r.temperature,
-            'timestamp': r.timestamp.isoformat() if r.timestamp else None
-        }
-        for r in records
-    ]
+    telemetry_data = telemetry_array(reversed(records))
     
     # Get predictions
-    predictions = model_service.predict_power(telemetry_data)
+    predictions = await asyncio.to_thread(model_service.predict_power, telemetry_data)
     
     if predictions is None:
         raise HTTPException(
@@ -82,24 +149,25 @@ def predict_power(
             detail="Model service unavailable. Check if model is trained and loaded."
         )
     
+    errors = predictions['errors']
     return {
         'panel_id': str(panel_id),
-        'total_predictions': len(predictions),
-        'predictions': predictions[-10:],  # Return last 10 predictions
+        'total_predictions': len(predictions['per_step']),
+        'predictions': predictions['per_step'][-10:],  # Return last 10 predictions
         'summary': {
-            'avg_error': round(sum(p['error'] for p in predictions) / len(predictions), 2),
-            'max_error': round(max(p['error'] for p in predictions), 2),
-            'avg_error_percent': round(sum(p['error_percent'] for p in predictions) / len(predictions), 2)
+            'avg_error': round(float(errors.mean()), 2),
+            'max_error': round(float(errors.max()), 2),
+            'avg_error_percent': round(float(predictions['errors_pct'].mean()), 2)
         }
     }
 
 
 @router.get("/anomalies", response_model=dict)
-def detect_anomalies(
+async def detect_anomalies(
     panel_id: uuid.UUID,
     threshold: float = Query(default=5.0, ge=1.0, le=50.0),
     hours: int = Query(default=24, ge=1, le=168),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Detect anomalies in telemetry data based on prediction errors
@@ -109,35 +177,22 @@ def detect_anomalies(
         threshold: Error threshold in watts for anomaly detection
         hours: Number of hours to analyze (default: 24)
     """
-    # Fetch recent telemetry data
-    since = datetime.utcnow() - timedelta(hours=hours)
-    records = (
-        db.query(Telemetry)
-        .filter(Telemetry.panel_id == panel_id)
-        .filter(Telemetry.timestamp >= since)
-        .order_by(Telemetry.timestamp.asc())
-        .all()
-    )
+    params = {'panel_id': panel_id, 'since': datetime.now(timezone.utc) - timedelta(hours=hours)}
     
-    if len(records) < 20:
+    if await _count_upto(db, *_ANOMALY_WINDOW, params=params) < MIN_RECORDS:
         raise HTTPException(
             status_code=400,
             detail=f"Insufficient data for anomaly detection. Need at least 20 records in last {hours} hours"
         )
     
-    # Convert to dict format
-    telemetry_data = [
-        {
-            'voltage': r.voltage,
-            'current': r.current,
-            'temperature': r.temperature,
-            'timestamp': r.timestamp.isoformat() if r.timestamp else None
-        }
-        for r in records
-    ]
+    # Fetch recent telemetry data
+    result = await db.execute(_ANOMALY_STMT, params)
+    records = result.all()
+    
+    telemetry_data = telemetry_array(records)
     
     # Detect anomalies
-    anomalies = model_service.detect_anomalies(telemetry_data, threshold)
+    anomalies = await asyncio.to_thread(model_service.detect_anomalies, telemetry_data, threshold)
     
     return {
         'panel_id': str(panel_id),
@@ -150,22 +205,22 @@ def detect_anomalies(
 
 
 @router.get("/predict-next", response_model=dict)
-def predict_next_power(
+async def predict_next_power(
     panel_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Predict next power output based on recent telemetry
     Requires at least 20 recent records
     """
     # Fetch recent telemetry data
-    records = (
-        db.query(Telemetry)
-        .filter(Telemetry.panel_id == panel_id)
+    result = await db.execute(
+        select(*MODEL_COLUMNS)
+        .where(Telemetry.panel_id == panel_id)
         .order_by(Telemetry.timestamp.desc())
         .limit(20)
-        .all()
     )
+    records = result.all()
     
     if len(records) < 20:
         raise HTTPException(
@@ -174,21 +229,10 @@ def predict_next_power(
         )
     
     # Reverse to chronological order
-    records = list(reversed(records))
-    
-    # Convert to dict format
-    telemetry_data = [
-        {
-            'voltage': r.voltage,
-            'current': r.current,
-            'temperature': r.temperature,
-            'timestamp': r.timestamp.isoformat() if r.timestamp else None
-        }
-        for r in records
-    ]
+    telemetry_data = telemetry_array(reversed(records))
     
     # Predict next
-    prediction = model_service.predict_next(telemetry_data)
+    prediction = await asyncio.to_thread(model_service.predict_next, telemetry_data)
     
     if prediction is None:
         raise HTTPException(
@@ -4,3 +4,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Async engine URL; psycopg 3 serves both sync and async under the same dialect
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+if not ASYNC_DATABASE_URL and DATABASE_URL:
+    ASYNC_DATABASE_URL = DATABASE_URL
+    for prefix in ("postgresql://", "postgres://", "postgresql+psycopg2://"):
+        if DATABASE_URL.startswith(prefix):
+            ASYNC_DATABASE_URL = "postgresql+psycopg://" + DATABASE_URL[len(prefix):]
+            break
+
+# Connection pool per engine (the sync and async engines each get one)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
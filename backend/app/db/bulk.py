@@ -0,0 +1,22 @@
+"""
+Import-time guard for bulk INSERT ... RETURNING statements
+sort_by_parameter_order needs a sentinel column; without one SQLAlchemy quietly falls back to
+one round trip per row, so a model change that drops the sentinel should fail loudly instead
+"""
+
+from sqlalchemy import Insert
+from sqlalchemy.dialects import postgresql
+
+
+def require_insert_sentinel(stmt: Insert, *param_keys: str) -> Insert:
+    """Compile stmt as an executemany over param_keys and raise if it has no sentinel column"""
+    compiled = stmt.compile(
+        dialect=postgresql.psycopg.dialect(), for_executemany=True, column_keys=list(param_keys)
+    )
+    imv = compiled._insertmanyvalues
+    if imv is None or not imv.sentinel_columns:
+        raise RuntimeError(
+            f"{stmt.table.name} bulk insert has no insert sentinel; "
+            "ordered RETURNING would run one row per round trip"
+        )
+    return stmt
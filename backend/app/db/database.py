@@ -1,10 +1,38 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Shared by the sync and async engines
+ENGINE_OPTIONS = dict(
+    # Compiled-SQL cache per engine (default 500); room for every route's statements
+    query_cache_size=1200,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=DB_POOL_RECYCLE,
+    # LIFO reuse keeps a small hot set of connections and lets idle extras time out
+    pool_use_lifo=True,
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    DATABASE_URL,
+    insertmanyvalues_page_size=1000,  # rows per multi-VALUES INSERT for bulk writes
+    **ENGINE_OPTIONS,
+)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Used by the async endpoints so slow requests don't hold a threadpool worker
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **ENGINE_OPTIONS)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
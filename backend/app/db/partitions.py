@@ -0,0 +1,62 @@
+"""
+Monthly range partitions for the telemetry table
+Run at startup and from cron (python -m app.db.partitions) so next month's partition
+exists before its first reading arrives; old months can then be detached or dropped whole
+"""
+
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import DBAPIError
+
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+_IS_PARTITIONED = text(
+    "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('telemetry')"
+)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def ensure_telemetry_partitions(bind: Engine = engine, months_ahead: int = 2) -> list[str]:
+    """Create telemetry_YYYY_MM for the current month and the next months_ahead; returns new names"""
+    if bind.dialect.name != "postgresql":
+        return []
+
+    with bind.connect() as conn:
+        if conn.execute(_IS_PARTITIONED).first() is None:
+            logger.warning("telemetry is not a partitioned table; skipping partition maintenance")
+            return []
+
+    created = []
+    start = datetime.now(timezone.utc).date().replace(day=1)
+    for _ in range(months_ahead + 1):
+        end = _next_month(start)
+        name = f"telemetry_{start:%Y_%m}"
+        try:
+            with bind.begin() as conn:
+                exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+                if exists is None:
+                    conn.execute(text(
+                        f"CREATE TABLE {name} PARTITION OF telemetry "
+                        f"FOR VALUES FROM ('{start} 00:00+00') TO ('{end} 00:00+00')"
+                    ))
+                    created.append(name)
+        except DBAPIError as exc:
+            # Typically rows for this month already sit in telemetry_default
+            logger.warning(f"Could not create partition {name}: {exc.orig}")
+        start = end
+
+    if created:
+        logger.info(f"Created telemetry partitions: {', '.join(created)}")
+    return created
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ensure_telemetry_partitions()
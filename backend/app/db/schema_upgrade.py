@@ -0,0 +1,123 @@
+"""
+In-place upgrades for databases created before the current models
+create_all only adds missing tables, so narrowed column types, the generated power column, new
+constraints and changed indexes on existing tables are applied here. Every step checks the
+catalog first, so it is safe to rerun; runs at startup before partition maintenance and by hand
+(python -m app.db.schema_upgrade)
+"""
+
+import logging
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
+
+from app.db.database import engine
+from app.models.telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+# (table, column, target type as information_schema spells it)
+_COLUMN_TYPES = (
+    ("telemetry", "voltage", "real"),
+    ("telemetry", "current", "real"),
+    ("telemetry", "temperature", "real"),
+    ("sites", "location_lat", "real"),
+    ("sites", "location_lng", "real"),
+    ("mission_images", "width", "smallint"),
+    ("mission_images", "height", "smallint"),
+)
+
+# (table, constraint name, CHECK expression), mirroring the models' CheckConstraints
+_CHECKS = (
+    ("telemetry", "ck_telemetry_voltage_range", "voltage BETWEEN 0 AND 2000"),
+    ("telemetry", "ck_telemetry_current_range", "current BETWEEN 0 AND 100"),
+    ("telemetry", "ck_telemetry_temperature_range", "temperature BETWEEN -60 AND 150"),
+)
+
+# Must run after the type changes: Postgres won't retype a column a generated column reads
+_ADD_POWER = (
+    "ALTER TABLE telemetry ADD COLUMN IF NOT EXISTS power REAL "
+    "GENERATED ALWAYS AS (voltage * current) STORED"
+)
+
+# Model indexes to (re)build, with the fragments an up-to-date indexdef must contain
+_INDEXES = {
+    "ix_telemetry_panel_ts": ("id DESC", "power"),
+    "ix_telemetry_panel_power": (),
+}
+
+_COLUMN_TYPE = text(
+    "SELECT data_type FROM information_schema.columns "
+    "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+)
+
+_MISSING_CONSTRAINT = text(
+    "SELECT to_regclass(:table) IS NOT NULL AND NOT EXISTS ("
+    "SELECT 1 FROM pg_constraint WHERE conrelid = to_regclass(:table) AND conname = :name)"
+)
+
+_INDEX_DEF = text(
+    "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"
+)
+
+
+def _index_steps(conn, bind: Engine) -> list[tuple[str, tuple[str, ...]]]:
+    steps = []
+    indexes = {idx.name: idx for idx in Telemetry.__table__.indexes}
+    for name, fragments in _INDEXES.items():
+        create = str(CreateIndex(indexes[name]).compile(dialect=bind.dialect))
+        indexdef = conn.execute(_INDEX_DEF, {"name": name}).scalar()
+        if indexdef is None:
+            steps.append((name, (create,)))
+        elif not all(f in indexdef for f in fragments):
+            steps.append((f"rebuild {name}", (f"DROP INDEX {name}", create)))
+    return steps
+
+
+def _pending_steps(bind: Engine) -> list[tuple[str, tuple[str, ...]]]:
+    """(label, DDL statements) for every step the database still needs, in the order they must run"""
+    steps = []
+    with bind.connect() as conn:
+        for table, column, type_ in _COLUMN_TYPES:
+            current = conn.execute(_COLUMN_TYPE, {"table": table, "column": column}).scalar()
+            if current is not None and current != type_:
+                steps.append((
+                    f"{table}.{column} {current} -> {type_}",
+                    (f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_}",),
+                ))
+        if conn.execute(text("SELECT to_regclass('telemetry')")).scalar() is None:
+            return steps
+        if conn.execute(_COLUMN_TYPE, {"table": "telemetry", "column": "power"}).scalar() is None:
+            steps.append(("telemetry.power", (_ADD_POWER,)))
+        for table, name, check in _CHECKS:
+            if conn.execute(_MISSING_CONSTRAINT, {"table": table, "name": name}).scalar():
+                steps.append((name, (f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({check})",)))
+        steps += _index_steps(conn, bind)
+    return steps
+
+
+def upgrade_schema(bind: Engine = engine) -> list[str]:
+    """Bring existing tables up to the models' columns, constraints and indexes; returns the applied steps"""
+    if bind.dialect.name != "postgresql":
+        return []
+
+    applied = []
+    for label, ddls in _pending_steps(bind):
+        try:
+            with bind.begin() as conn:
+                for ddl in ddls:
+                    conn.execute(text(ddl))
+            applied.append(label)
+        except DBAPIError as exc:
+            # e.g. existing rows outside a CHECK range; the rest of the upgrade still runs
+            logger.warning(f"Could not apply {label}: {exc.orig}")
+
+    if applied:
+        logger.info(f"Applied schema upgrades: {', '.join(applied)}")
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade_schema()
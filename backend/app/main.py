@@ -1,5 +1,10 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.db.database import engine, Base
+from fastapi.responses import ORJSONResponse
+from app.db.database import async_engine, engine, Base
+from app.db.partitions import ensure_telemetry_partitions
+from app.db.schema_upgrade import upgrade_schema
 from app.api.sites import router as sites_router
 from app.api.panels import router as panels_router
 from app.api.telemetry import router as telemetry_router
@@ -7,8 +12,33 @@ from app.api.faults import router as faults_router
 from app.api.mission import router as mission_router
 from app.api.mission_images import router as mission_images_router
 from app.api.inspection_results import router as inspection_results_router
+from app.services.model_service import model_service
 
-app = FastAPI(title="SolarSense API")
+
+def _warm_pool():
+    # Hold the connections together so the pool really opens pool_size of them
+    conns = [engine.connect() for _ in range(engine.pool.size())]
+    for conn in conns:
+        conn.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay connection setup, the model load and the first Keras call at startup, not on the first request
+    await asyncio.to_thread(_warm_pool)
+    await asyncio.to_thread(upgrade_schema)
+    await asyncio.to_thread(ensure_telemetry_partitions)
+    async with async_engine.connect():
+        pass
+    await asyncio.to_thread(model_service.load)
+    await asyncio.to_thread(model_service.warmup)
+    yield
+    await async_engine.dispose()
+    engine.dispose()
+
+
+# orjson renders the (often large) list and prediction payloads natively, UUIDs/datetimes included
+app = FastAPI(title="SolarSense API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 Base.metadata.create_all(bind=engine)
 
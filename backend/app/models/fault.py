@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, ForeignKey, func
+from sqlalchemy import String, Float, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,10 @@ from app.db.database import Base
 
 class Fault(Base):
     __tablename__ = "faults"
+    __table_args__ = (
+        # list_faults: filter by panel, newest first
+        Index("ix_fault_panel_detected", "panel_id", "detected_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -19,7 +23,6 @@ class Fault(Base):
         UUID(as_uuid=True),
         ForeignKey("panels.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     fault_type: Mapped[str] = mapped_column(String, nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import ForeignKey, Enum, Float, Text, DateTime, func
+from sqlalchemy import ForeignKey, Enum, Float, Text, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -15,6 +15,12 @@ class InspectionStatus(str, enum.Enum):
 
 class InspectionResult(Base):
     __tablename__ = "inspection_results"
+    __table_args__ = (
+        # list_inspection_results: newest first
+        Index("ix_inspection_result_inspected", "inspected_at"),
+        # Results for one image, newest first
+        Index("ix_inspection_result_image_inspected", "mission_image_id", text("inspected_at DESC")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -1,16 +1,24 @@
 
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, ForeignKey, func
+from sqlalchemy import String, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+if TYPE_CHECKING:
+    from app.models.mission_images import MissionImage
+
 
 class Mission(Base):
     __tablename__ = "missions"
+    __table_args__ = (
+        # list_missions: optional status filter, newest first
+        Index("ix_mission_status_created", "status", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -23,7 +31,7 @@ class Mission(Base):
         index=True,
     )
 
-    status: Mapped[str] = mapped_column(String, nullable=False, default="DRAFT", index=True)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="DRAFT")
 
     approved_by_user_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), nullable=True
@@ -37,10 +45,10 @@ class Mission(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    # One mission -> many images
-    images = relationship(
-        "MissionImage",
+    # One mission -> many images (newest first, same order as list_mission_images)
+    images: Mapped[list["MissionImage"]] = relationship(
         back_populates="mission",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        order_by="MissionImage.uploaded_at.desc()",
     )
\ No newline at end of file
@@ -1,36 +1,49 @@
 
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, func
+from sqlalchemy import String, SmallInteger, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+if TYPE_CHECKING:
+    from app.models.mission import Mission
+
 
 class MissionImage(Base):
     __tablename__ = "mission_images"
+    __table_args__ = (
+        # list_mission_images: images of one mission, newest first (keyset on uploaded_at, id)
+        Index("ix_mission_images_mission_uploaded", "mission_id", text("uploaded_at DESC"), text("id DESC")),
+    )
 
+    # Client-side uuid4 as the insertmanyvalues sentinel, like telemetry ids
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
+        insert_sentinel=True,
     )
 
     mission_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("missions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     storage_key: Mapped[str] = mapped_column(String, nullable=False)
     content_type: Mapped[str] = mapped_column(String, nullable=False)
 
-    width: Mapped[int] = mapped_column(Integer, nullable=False)
-    height: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Pixel dimensions; SMALLINT covers frames up to 32767 px per side
+    width: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    height: Mapped[int] = mapped_column(SmallInteger, nullable=False)
 
     uploaded_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    mission = relationship("Mission", back_populates="images")
\ No newline at end of file
+    mission: Mapped["Mission"] = relationship(back_populates="images")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, func
+from sqlalchemy import String, REAL, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,8 +17,9 @@ class Site(Base):
 
     name: Mapped[str] = mapped_column(String, nullable=False)
 
-    location_lat: Mapped[float | None] = mapped_column(Float, nullable=True)
-    location_lng: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # REAL keeps ~7 significant digits, i.e. well under a metre at site scale
+    location_lat: Mapped[float | None] = mapped_column(REAL, nullable=True)
+    location_lng: Mapped[float | None] = mapped_column(REAL, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
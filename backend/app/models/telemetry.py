@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Float, DateTime, ForeignKey, func
+from sqlalchemy import DDL, REAL, CheckConstraint, Computed, DateTime, ForeignKey, Index, event, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,22 +10,62 @@ from app.db.database import Base
 
 class Telemetry(Base):
     __tablename__ = "telemetry"
+    __table_args__ = (
+        # Latest-N-per-panel reads (list + ML endpoints): matches the (timestamp, id) keyset
+        # ORDER BY, and the INCLUDE columns let the ML queries run as index-only scans
+        Index(
+            "ix_telemetry_panel_ts",
+            "panel_id",
+            text("timestamp DESC"),
+            text("id DESC"),
+            postgresql_include=["voltage", "current", "temperature", "power"],
+        ),
+        # Range lookups on a panel's power output (e.g. "readings above X W")
+        Index("ix_telemetry_panel_power", "panel_id", "power"),
+        # Physical sensor ranges; also give the planner bounds for row estimates
+        CheckConstraint("voltage BETWEEN 0 AND 2000", name="ck_telemetry_voltage_range"),
+        CheckConstraint("current BETWEEN 0 AND 100", name="ck_telemetry_current_range"),
+        CheckConstraint("temperature BETWEEN -60 AND 150", name="ck_telemetry_temperature_range"),
+        # Tiny summary index for time-range scans over old, append-ordered partitions
+        Index("ix_telemetry_ts_brin", "timestamp", postgresql_using="brin"),
+        # Monthly range partitions (app.db.partitions); queries on recent data prune to one
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
+    # uuid4 client-side so bulk INSERT ... RETURNING can use id as its insertmanyvalues
+    # sentinel and stay batched in payload order; the server default covers COPY/raw SQL
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
+        insert_sentinel=True,
     )
 
     panel_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("panels.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
-    voltage: Mapped[float] = mapped_column(Float, nullable=False)
-    current: Mapped[float] = mapped_column(Float, nullable=False)
-    temperature: Mapped[float] = mapped_column(Float, nullable=False)
+    # REAL (4 bytes): sensors report ~3 decimals, and narrower rows fit more per page
+    voltage: Mapped[float] = mapped_column(REAL, nullable=False)
+    current: Mapped[float] = mapped_column(REAL, nullable=False)
+    temperature: Mapped[float] = mapped_column(REAL, nullable=False)
+
+    # Computed once by Postgres at write time; readers never re-derive voltage * current
+    power: Mapped[float] = mapped_column(REAL, Computed("voltage * current", persisted=True))
 
+    # Part of the primary key because Postgres requires the partition key in unique constraints
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), primary_key=True
     )
+
+
+# Catches rows outside the monthly partitions so inserts never fail for lack of one
+event.listen(
+    Telemetry.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS telemetry_default PARTITION OF telemetry DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
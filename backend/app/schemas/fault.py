@@ -18,3 +18,13 @@ class FaultOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "FaultOut":
+        return cls.model_construct(
+            id=row.id,
+            panel_id=row.panel_id,
+            fault_type=row.fault_type,
+            confidence=row.confidence,
+            detected_at=row.detected_at,
+        )
@@ -40,3 +40,19 @@ class InspectionResultOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "InspectionResultOut":
+        return cls.model_construct(
+            id=row.id,
+            mission_id=row.mission_id,
+            panel_id=row.panel_id,
+            mission_image_id=row.mission_image_id,
+            status=InspectionStatus(row.status),  # model enum member is PASS_, value "PASS"
+            defect_type=row.defect_type,
+            confidence=row.confidence,
+            bbox=row.bbox,
+            notes=row.notes,
+            inspected_at=row.inspected_at,
+            model_version=row.model_version,
+        )
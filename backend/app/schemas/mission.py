@@ -28,4 +28,15 @@ class MissionOut(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "MissionOut":
+        return cls.model_construct(
+            id=row.id,
+            panel_id=row.panel_id,
+            status=row.status,
+            approved_by_user_id=row.approved_by_user_id,
+            approved_at=row.approved_at,
+            created_at=row.created_at,
+        )
\ No newline at end of file
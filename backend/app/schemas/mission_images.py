@@ -1,5 +1,5 @@
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 
@@ -8,8 +8,13 @@ class MissionImageCreate(BaseModel):
     mission_id: UUID
     storage_key: str
     content_type: str
-    width: int
-    height: int
+    # Stored as SMALLINT
+    width: int = Field(gt=0, le=32767)
+    height: int = Field(gt=0, le=32767)
+
+
+# All frames uploaded after a drone flight
+MissionImageBulkCreate = list[MissionImageCreate]
 
 
 class MissionImageOut(BaseModel):
@@ -22,4 +27,16 @@ class MissionImageOut(BaseModel):
     uploaded_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "MissionImageOut":
+        return cls.model_construct(
+            id=row.id,
+            mission_id=row.mission_id,
+            storage_key=row.storage_key,
+            content_type=row.content_type,
+            width=row.width,
+            height=row.height,
+            uploaded_at=row.uploaded_at,
+        )
\ No newline at end of file
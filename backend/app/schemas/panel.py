@@ -26,3 +26,13 @@ class PanelOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "PanelOut":
+        return cls.model_construct(
+            id=row.id,
+            site_id=row.site_id,
+            label=row.label,
+            serial_number=row.serial_number,
+            status=PanelStatus(row.status),  # model-side enum -> schema enum
+        )
@@ -11,3 +11,10 @@ class SiteOut(SiteCreate):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "SiteOut":
+        # Trusted DB row (ORM object or Row): skip validation
+        return cls.model_construct(
+            id=row.id, name=row.name, location_lat=row.location_lat, location_lng=row.location_lng
+        )
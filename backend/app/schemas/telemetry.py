@@ -1,13 +1,20 @@
 import uuid
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TelemetryCreate(BaseModel):
     panel_id: uuid.UUID
-    voltage: float
-    current: float
-    temperature: float
+    # Same bounds as the table's CHECK constraints, so bad readings get a 422
+    voltage: float = Field(ge=0, le=2000)
+    current: float = Field(ge=0, le=100)
+    temperature: float = Field(ge=-60, le=150)
+    # When the sensor buffered the reading; omitted means "now" on the server
+    timestamp: datetime | None = None
+
+
+# Burst upload from a sensor that buffers readings locally
+TelemetryBulkCreate = list[TelemetryCreate]
 
 
 class TelemetryOut(BaseModel):
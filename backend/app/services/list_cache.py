@@ -0,0 +1,61 @@
+"""
+In-process cache for small, read-heavy list endpoints (sites, panels)
+Stores the serialized JSON body with an ETag so browsers can revalidate with 304
+"""
+
+import hashlib
+import threading
+from typing import Hashable, Optional
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+
+
+class CachedBody:
+    """Serialized response body plus its ETag"""
+
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+    def response(self, request: Request) -> Response:
+        headers = {'ETag': self.etag, 'Cache-Control': 'no-cache'}
+        if self.etag in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type='application/json', headers=headers)
+
+
+class ListCache:
+    """
+    TTL cache keyed on the list query parameters
+    Writers call clear() so a new row is visible on the next request, not after the TTL
+    """
+
+    def __init__(self, maxsize: int = 64, ttl: float = 30):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Sync endpoints run on the threadpool; TTLCache itself is not thread-safe
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def put(self, key: Hashable, body: bytes, version: int) -> CachedBody:
+        """Store body unless a write cleared the cache after version was read"""
+        entry = CachedBody(body)
+        with self._lock:
+            if version == self._version:
+                self._cache[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
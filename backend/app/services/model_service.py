@@ -3,53 +3,184 @@ ML Model Service for Real-time Telemetry Analysis
 Handles model loading, predictions, and anomaly detection
 """
 
+import os
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
-from tensorflow import keras
 from sklearn.preprocessing import StandardScaler
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+ML_DIR = Path(__file__).parent.parent.parent.parent / "ml"
+KERAS_MODEL_PATH = ML_DIR / "telemetry_power_model.h5"
+# Optional export of the same model (ml/export_telemetry_onnx.py); preferred when onnxruntime is installed
+ONNX_MODEL_PATH = ML_DIR / "telemetry_power_model.onnx"
+# Feature/target scaling saved by the training script; without it scalers are fitted per request
+SCALER_PATH = ML_DIR / "telemetry_power_scaler.npz"
+
+
+def _restore_scaler(scaler: StandardScaler, mean: np.ndarray, scale: np.ndarray):
+    scaler.mean_ = mean.astype(np.float64)
+    scaler.scale_ = scale.astype(np.float64)
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(scaler.mean_)
+    scaler.n_samples_seen_ = 0
+
+# Column layout the service works on internally; API handlers build it straight from SQL rows
+TELEMETRY_DTYPE = np.dtype([
+    ('voltage', 'f8'),
+    ('current', 'f8'),
+    ('temperature', 'f8'),
+    ('power', 'f8'),
+    ('timestamp', 'O'),
+])
+
+TelemetryData = Union[np.ndarray, List[Dict]]
+
+
+def telemetry_array(rows) -> np.ndarray:
+    """Pack (voltage, current, temperature, power, timestamp) rows into a TELEMETRY_DTYPE array"""
+    return np.array([tuple(r) for r in rows], dtype=TELEMETRY_DTYPE)
+
+
+def _as_array(telemetry_data: TelemetryData) -> np.ndarray:
+    if isinstance(telemetry_data, np.ndarray):
+        return telemetry_data
+    return telemetry_array(
+        (d['voltage'], d['current'], d['temperature'],
+         d.get('power', d['voltage'] * d['current']), d.get('timestamp'))
+        for d in telemetry_data
+    )
+
+
+def _features(data: np.ndarray) -> np.ndarray:
+    return np.column_stack((data['voltage'], data['current'], data['temperature']))
+
+
+def _iso(ts):
+    return ts.isoformat() if hasattr(ts, 'isoformat') else ts
+
+
 class TelemetryModelService:
     """Service for loading and using the trained telemetry prediction model"""
     
     def __init__(self):
         self.model = None
+        self.model_path = None
+        self._onnx_input = None  # (input name, numpy dtype) when self.model is an ORT session
         self.scaler_X = StandardScaler()
         self.scaler_y = StandardScaler()
         self.sequence_length = 20
         self.is_fitted = False
-        self._load_model()
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    def load(self):
+        """
+        Load the model once per process. Called from the app's lifespan hook, i.e. in each
+        worker after any fork: the TensorFlow runtime is not fork-safe, so it must not be
+        initialised at import time in a preloading parent process.
+        """
+        with self._load_lock:
+            if not self._loaded:
+                self._load_model()
+                self._load_scalers()
+                self._loaded = True
     
     def _load_model(self):
-        """Load the trained LSTM model"""
-        model_path = Path(__file__).parent.parent.parent.parent / "ml" / "telemetry_power_model.h5"
+        """Load the trained LSTM model, from the ONNX export if available"""
+        if ONNX_MODEL_PATH.exists() and self._load_onnx(ONNX_MODEL_PATH):
+            return
         
+        model_path = KERAS_MODEL_PATH
         if not model_path.exists():
             logger.warning(f"Model not found at {model_path}. Predictions will not be available.")
             return
         
         try:
+            from tensorflow import keras  # deferred: importing TF costs seconds and a lot of memory
+            
             self.model = keras.models.load_model(str(model_path), compile=False)
+            self.model_path = model_path
             logger.info(f"Model loaded successfully from {model_path}")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             self.model = None
     
-    def fit_scalers(self, telemetry_data: List[Dict]):
+    def _load_scalers(self):
+        """Use the scaling the model was trained with instead of refitting on request data"""
+        if not SCALER_PATH.exists():
+            logger.warning(f"Scalers not found at {SCALER_PATH}. They will be fitted on request data.")
+            return
+        
+        try:
+            with np.load(SCALER_PATH) as saved:
+                _restore_scaler(self.scaler_X, saved['x_mean'], saved['x_scale'])
+                _restore_scaler(self.scaler_y, saved['y_mean'], saved['y_scale'])
+        except Exception as e:
+            logger.error(f"Failed to load scalers: {e}")
+            return
+        
+        self.is_fitted = True
+        logger.info(f"Scalers loaded from {SCALER_PATH}")
+    
+    def _load_onnx(self, model_path: Path) -> bool:
+        """Load the ONNX export with onnxruntime; False (fall back to Keras) if that isn't possible"""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.info("onnxruntime not installed, using the Keras model")
+            return False
+        
+        try:
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+            session = ort.InferenceSession(
+                str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+            )
+        except Exception as e:
+            logger.error(f"Failed to load ONNX model: {e}")
+            return False
+        
+        model_input = session.get_inputs()[0]
+        dtype = np.float16 if model_input.type == 'tensor(float16)' else np.float32
+        self.model = session
+        self.model_path = model_path
+        self._onnx_input = (model_input.name, dtype)
+        logger.info(f"ONNX model loaded successfully from {model_path}")
+        return True
+    
+    def _infer(self, sequences: np.ndarray) -> np.ndarray:
+        """Run the model on (n, sequence_length, 3) windows; returns (n, 1) float32"""
+        if self._onnx_input is not None:
+            name, dtype = self._onnx_input
+            out = self.model.run(None, {name: sequences.astype(dtype, copy=False)})[0]
+            return out.astype(np.float32, copy=False)
+        # Requests are at most ~1000 windows: a direct call skips predict()'s batching/callback setup
+        return np.asarray(self.model(sequences, training=False))
+    
+    def warmup(self):
+        """Run one dummy inference so graph tracing happens before the first real request"""
+        self.load()
+        if self.model is None:
+            return
+        
+        self._infer(np.zeros((1, self.sequence_length, 3), dtype=np.float32))
+        logger.info("Model warmed up")
+    
+    def fit_scalers(self, telemetry_data: TelemetryData):
         """Fit scalers on historical data"""
         if len(telemetry_data) < 100:
             logger.warning("Insufficient data to fit scalers. Need at least 100 records.")
             return False
         
-        features = np.array([
-            [d['voltage'], d['current'], d['temperature']] 
-            for d in telemetry_data
-        ])
-        power = np.array([[d['voltage'] * d['current']] for d in telemetry_data])
+        data = _as_array(telemetry_data)
+        features = _features(data)
+        power = data['power'].reshape(-1, 1)
         
         self.scaler_X.fit(features)
         self.scaler_y.fit(power)
@@ -57,7 +188,7 @@ class TelemetryModelService:
         logger.info(f"Scalers fitted on {len(telemetry_data)} records")
         return True
     
-    def create_sequences(self, telemetry_data: List[Dict]) -> Optional[np.ndarray]:
+    def create_sequences(self, telemetry_data: TelemetryData) -> Optional[np.ndarray]:
         """Create sequences from telemetry data for LSTM input"""
         if not self.is_fitted:
             raise ValueError("Scalers not fitted. Call fit_scalers first.")
@@ -67,33 +198,37 @@ class TelemetryModelService:
             return None
         
         # Extract features and scale
-        features = np.array([
-            [d['voltage'], d['current'], d['temperature']] 
-            for d in telemetry_data
-        ])
+        features = _features(_as_array(telemetry_data))
         scaled_features = self.scaler_X.transform(features)
         
-        # Create sequences
-        sequences = []
-        for i in range(len(scaled_features) - self.sequence_length):
-            sequences.append(scaled_features[i:i + self.sequence_length])
+        # Create sequences: the window starting at i predicts step i + sequence_length,
+        # so the last full window (which has no target) is dropped
+        n_windows = len(scaled_features) - self.sequence_length
+        if n_windows <= 0:
+            return None
         
-        return np.array(sequences) if sequences else None
+        windows = sliding_window_view(scaled_features, self.sequence_length, axis=0)[:n_windows]
+        # (n, 3, L) view -> contiguous (n, L, 3) float32, the dtype Keras runs in
+        return np.ascontiguousarray(windows.transpose(0, 2, 1), dtype=np.float32)
     
-    def predict_power(self, telemetry_data: List[Dict]) -> Optional[List[Dict]]:
+    def predict_power(self, telemetry_data: TelemetryData) -> Optional[Dict]:
         """
         Predict power output from telemetry sequences
         
         Args:
-            telemetry_data: List of telemetry records with voltage, current, temperature
+            telemetry_data: TELEMETRY_DTYPE array (or list of dicts) with voltage, current, temperature
         
         Returns:
-            List of predictions with actual vs predicted power, timestamps, errors
+            Dict with 'per_step' (list of predictions with actual vs predicted power,
+            timestamps, errors) and the raw 'errors' / 'errors_pct' arrays for summaries
         """
+        self.load()
         if self.model is None:
             logger.error("Model not loaded. Cannot make predictions.")
             return None
         
+        telemetry_data = _as_array(telemetry_data)
+        
         if not self.is_fitted:
             if not self.fit_scalers(telemetry_data):
                 return None
@@ -103,32 +238,34 @@ class TelemetryModelService:
             return None
         
         # Make predictions
-        predictions_scaled = self.model.predict(sequences, verbose=0)
+        predictions_scaled = self._infer(sequences)
         predictions = self.scaler_y.inverse_transform(predictions_scaled)
         
-        # Calculate actual power and errors
-        results = []
-        for i, pred in enumerate(predictions):
-            idx = i + self.sequence_length
-            actual_power = telemetry_data[idx]['voltage'] * telemetry_data[idx]['current']
-            predicted_power = float(pred[0])
-            error = abs(actual_power - predicted_power)
-            error_percent = (error / (actual_power + 1e-8)) * 100
-            
-            results.append({
-                'timestamp': telemetry_data[idx].get('timestamp'),
-                'actual_power': round(actual_power, 2),
-                'predicted_power': round(predicted_power, 2),
-                'error': round(error, 2),
-                'error_percent': round(error_percent, 2),
-                'voltage': telemetry_data[idx]['voltage'],
-                'current': telemetry_data[idx]['current'],
-                'temperature': telemetry_data[idx]['temperature']
-            })
-        
-        return results
+        # Errors for every predicted step at once, against the stored power column
+        targets = telemetry_data[self.sequence_length:self.sequence_length + len(predictions)]
+        actual = targets['power']
+        predicted = predictions[:, 0].astype(np.float64)
+        errors = np.abs(actual - predicted)
+        errors_pct = errors / (actual + 1e-8) * 100
+        
+        # Round and convert whole columns, then build the dicts in one zip at the boundary
+        columns = zip(
+            [_iso(ts) for ts in targets['timestamp']],
+            np.round(actual, 2).tolist(),
+            np.round(predicted, 2).tolist(),
+            np.round(errors, 2).tolist(),
+            np.round(errors_pct, 2).tolist(),
+            targets['voltage'].tolist(),
+            targets['current'].tolist(),
+            targets['temperature'].tolist(),
+        )
+        keys = ('timestamp', 'actual_power', 'predicted_power', 'error', 'error_percent',
+                'voltage', 'current', 'temperature')
+        results = [dict(zip(keys, values)) for values in columns]
+        
+        return {'per_step': results, 'errors': errors, 'errors_pct': errors_pct}
     
-    def detect_anomalies(self, telemetry_data: List[Dict], threshold: float = 5.0) -> List[Dict]:
+    def detect_anomalies(self, telemetry_data: TelemetryData, threshold: float = 5.0) -> List[Dict]:
         """
         Detect anomalies in telemetry data based on prediction errors
         
@@ -144,7 +281,7 @@ class TelemetryModelService:
             return []
         
         anomalies = []
-        for pred in predictions:
+        for pred in predictions['per_step']:
             if pred['error'] > threshold:
                 anomalies.append({
                     'timestamp': pred['timestamp'],
@@ -162,7 +299,7 @@ class TelemetryModelService:
         
         return anomalies
     
-    def predict_next(self, recent_telemetry: List[Dict]) -> Optional[Dict]:
+    def predict_next(self, recent_telemetry: TelemetryData) -> Optional[Dict]:
         """
         Predict next power output based on recent telemetry
         
@@ -172,6 +309,7 @@ class TelemetryModelService:
         Returns:
             Predicted power for next timestep
         """
+        self.load()
         if self.model is None:
             return None
         
@@ -179,6 +317,8 @@ class TelemetryModelService:
             logger.warning(f"Need at least {self.sequence_length} recent records for prediction")
             return None
         
+        recent_telemetry = _as_array(recent_telemetry)
+        
         if not self.is_fitted:
             if not self.fit_scalers(recent_telemetry):
                 return None
@@ -187,21 +327,18 @@ class TelemetryModelService:
         recent = recent_telemetry[-self.sequence_length:]
         
         # Extract and scale features
-        features = np.array([
-            [d['voltage'], d['current'], d['temperature']] 
-            for d in recent
-        ])
+        features = _features(recent)
         scaled = self.scaler_X.transform(features)
         
         # Create sequence and predict
         sequence = scaled.reshape(1, self.sequence_length, 3)
-        prediction_scaled = self.model.predict(sequence, verbose=0)
+        prediction_scaled = self._infer(sequence)
         prediction = self.scaler_y.inverse_transform(prediction_scaled)
         
         return {
             'predicted_power': round(float(prediction[0][0]), 2),
             'based_on_records': self.sequence_length,
-            'latest_timestamp': recent[-1].get('timestamp')
+            'latest_timestamp': _iso(recent[-1]['timestamp'])
         }
     
     def get_model_info(self) -> Dict:
@@ -210,7 +347,8 @@ class TelemetryModelService:
             'model_loaded': self.model is not None,
             'scalers_fitted': self.is_fitted,
             'sequence_length': self.sequence_length,
-            'model_path': str(Path(__file__).parent.parent.parent.parent / "ml" / "telemetry_power_model.h5")
+            'model_path': str(self.model_path or KERAS_MODEL_PATH),
+            'runtime': 'onnxruntime' if self._onnx_input is not None else 'keras',
         }
 
 
@@ -1,14 +1,16 @@
-from sqlalchemy import create_engine
-import os
-from dotenv import load_dotenv
+from sqlalchemy import text
 
-load_dotenv()
+from app.core.config import DATABASE_URL
+# The app's pooled engine (pre-ping, recycle): importing this module never opens a connection
+from app.db.database import engine
 
-db_url = os.getenv("DATABASE_URL")
 
-print("DB URL Loaded:", db_url[:30], "...")
+def check_connection():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
 
-engine = create_engine(db_url)
 
-with engine.connect() as conn:
+if __name__ == "__main__":
+    print("DB URL Loaded:", DATABASE_URL[:30], "...")
+    check_connection()
     print("✅ Connected to Supabase successfully!")
@@ -0,0 +1,57 @@
+"""
+Export the trained telemetry LSTM to ONNX for the backend's onnxruntime path
+Optionally converts the weights to FP16 (half the size, same accuracy for this small model)
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+WINDOW_SIZE = 20  # Must match the window the model was trained with
+N_FEATURES = 3    # voltage, current, temperature
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export telemetry Keras model to ONNX")
+    parser.add_argument('--target', type=str, default='power',
+                       choices=['voltage', 'current', 'temperature', 'power'],
+                       help='Which trained model to export')
+    parser.add_argument('--fp16', action='store_true',
+                       help='Store weights in float16 (inputs/outputs stay float32)')
+    parser.add_argument('--opset', type=int, default=17)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    import tf2onnx
+    import onnx
+
+    model_path = Path(__file__).parent / f"telemetry_{args.target}_model.h5"
+    onnx_path = model_path.with_suffix('.onnx')
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    spec = (tf.TensorSpec((None, WINDOW_SIZE, N_FEATURES), tf.float32, name='sequences'),)
+    onnx_model, _ = tf2onnx.convert.from_keras(model, input_signature=spec, opset=args.opset)
+
+    if args.fp16:
+        from onnxconverter_common import float16
+        onnx_model = float16.convert_float_to_float16(onnx_model, keep_io_types=True)
+
+    onnx.save(onnx_model, onnx_path)
+    print(f"ONNX model saved to: {onnx_path}")
+
+    # Sanity check against Keras on random windows
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return
+
+    x = np.random.default_rng(0).standard_normal((64, WINDOW_SIZE, N_FEATURES)).astype(np.float32)
+    session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+    ort_out = session.run(None, {session.get_inputs()[0].name: x})[0]
+    keras_out = model.predict(x, verbose=0)
+    print(f"Max abs difference vs Keras: {np.max(np.abs(ort_out - keras_out)):.6f}")
+
+
+if __name__ == "__main__":
+    main()
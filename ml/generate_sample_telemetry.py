@@ -7,6 +7,13 @@ import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import numpy as np
+from sqlalchemy import insert
+
+try:
+    # Optional: fuses the synthesis into one compiled, multi-threaded pass for very large runs
+    from numba import config as numba_config, njit, prange
+except ImportError:
+    njit = None
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
@@ -15,8 +22,84 @@ from app.db.database import SessionLocal
 from app.models.telemetry import Telemetry
 from app.models.panel import Panel
 
+PAGE_SIZE = 10_000  # rows per INSERT/COPY + commit
+
+BASE_VOLTAGE = 18.5
+MAX_CURRENT = 3.0
+
+# Below this (or on one core) NumPy is faster than compiling and running the Numba kernel
+FUSED_MIN_SAMPLES = 1_000_000
+
+_COPY_TELEMETRY = "COPY telemetry (panel_id, voltage, current, temperature, timestamp) FROM STDIN"
+
+
+def _copy_page(db, panel_id, rows):
+    """Stream (voltage, current, temperature, timestamp) rows into telemetry over COPY."""
+    cursor = db.connection().connection.cursor()
+    with cursor.copy(_COPY_TELEMETRY) as copy:
+        for v, c, t, ts in rows:
+            copy.write_row((panel_id, v, c, t, ts))
 
-def generate_realistic_telemetry(num_days=30, samples_per_hour=4):
+
+def _synth_numpy(hour, rng):
+    """Voltage, current and temperature for each hour-of-day value, as whole arrays."""
+    n = len(hour)
+    
+    # Whole series at once: one RNG call per noise source instead of several per sample
+    # Solar radiation simulation (0 at night, peak at noon), with weather variations
+    solar_factor = np.maximum(0, np.sin((hour - 6) * np.pi / 12))
+    solar_factor *= rng.uniform(0.7, 1.0, n)
+    
+    # Voltage: relatively stable, slight variation with temperature
+    voltage = BASE_VOLTAGE + rng.normal(0, 0.3, n) + solar_factor * 0.5
+    voltage = np.clip(voltage, 0, 21)  # Clamp to realistic range
+    
+    # Current: highly dependent on sunlight
+    current = MAX_CURRENT * solar_factor + rng.normal(0, 0.1, n)
+    current = np.clip(current, 0, MAX_CURRENT)
+    
+    # Temperature: ambient (20-30°C) + up to 20°C heating from sun
+    ambient_temp = 25 + rng.normal(0, 3, n)
+    temperature = ambient_temp + solar_factor * 20 + rng.normal(0, 1, n)
+    temperature = np.clip(temperature, 15, 65)  # Realistic range
+    
+    # Add occasional anomalies (5% chance): partial shading or dirt
+    anomaly = rng.random(n) < 0.05
+    current[anomaly] *= rng.uniform(0.3, 0.7, anomaly.sum())
+    
+    return voltage, current, temperature
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _synth_fused(n, interval_minutes, start_minute):
+        """Same model as _synth_numpy in one parallel pass, without the intermediate arrays."""
+        voltage = np.empty(n, dtype=np.float32)
+        current = np.empty(n, dtype=np.float32)
+        temperature = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            hour = ((start_minute + i * interval_minutes) % 1440) / 60.0
+            solar = max(0.0, np.sin((hour - 6) * np.pi / 12)) * np.random.uniform(0.7, 1.0)
+            v = BASE_VOLTAGE + np.random.normal(0, 0.3) + solar * 0.5
+            c = MAX_CURRENT * solar + np.random.normal(0, 0.1)
+            t = 25 + np.random.normal(0, 3) + solar * 20 + np.random.normal(0, 1)
+            c = min(max(c, 0.0), MAX_CURRENT)
+            if np.random.random() < 0.05:
+                c *= np.random.uniform(0.3, 0.7)
+            voltage[i] = min(max(v, 0.0), 21.0)
+            current[i] = c
+            temperature[i] = min(max(t, 15.0), 65.0)
+        return voltage, current, temperature
+else:
+    _synth_fused = None
+
+
+def _use_fused(n, seed):
+    return (_synth_fused is not None and seed is None and n >= FUSED_MIN_SAMPLES
+            and numba_config.NUMBA_NUM_THREADS > 1)
+
+
+def generate_realistic_telemetry(num_days=30, samples_per_hour=4, seed=None):
     """
     Generate realistic solar panel telemetry data.
     
@@ -51,66 +134,46 @@ def generate_realistic_telemetry(num_days=30, samples_per_hour=4):
         print(f"Generating {total_samples} telemetry records...")
         print(f"Time range: {num_days} days, sampling every {interval_minutes} minutes")
         
-        records = []
+        # Sample times as one datetime64 array (int64 arithmetic, no per-sample timedelta)
+        n = total_samples
+        offsets = (np.arange(n) * interval_minutes).astype('timedelta64[m]')
+        timestamps = np.datetime64(start_time, 'us') + offsets
         
-        for i in range(total_samples):
-            timestamp = start_time + timedelta(minutes=i * interval_minutes)
-            
-            # Hour of day (0-23)
-            hour = timestamp.hour + timestamp.minute / 60.0
-            
-            # Solar radiation simulation (0 at night, peak at noon)
-            # Using sine wave: peak at hour 12, zero at night
-            solar_factor = max(0, np.sin((hour - 6) * np.pi / 12))
-            
-            # Add some randomness and weather variations
-            weather_variation = np.random.uniform(0.7, 1.0)
-            solar_factor *= weather_variation
-            
-            # Voltage: relatively stable, slight variation with temperature
-            base_voltage = 18.5
-            voltage = base_voltage + np.random.normal(0, 0.3) + (solar_factor * 0.5)
-            voltage = max(0, min(21, voltage))  # Clamp to realistic range
-            
-            # Current: highly dependent on sunlight
-            max_current = 3.0
-            current = max_current * solar_factor + np.random.normal(0, 0.1)
-            current = max(0, min(max_current, current))
-            
-            # Temperature: ambient + solar heating
-            ambient_temp = 25 + np.random.normal(0, 3)  # 20-30°C ambient
-            solar_heating = solar_factor * 20  # Up to 20°C heating from sun
-            temperature = ambient_temp + solar_heating + np.random.normal(0, 1)
-            temperature = max(15, min(65, temperature))  # Realistic range
-            
-            # Add occasional anomalies (5% chance)
-            if np.random.random() < 0.05:
-                # Simulate partial shading or dirt
-                current *= np.random.uniform(0.3, 0.7)
-            
-            record = Telemetry(
-                panel_id=panel_id,
-                voltage=float(voltage),
-                current=float(current),
-                temperature=float(temperature),
-                timestamp=timestamp
-            )
-            
-            records.append(record)
-            
-            if (i + 1) % 1000 == 0:
-                print(f"  Generated {i + 1}/{total_samples} records...")
+        # Seeded runs stay on NumPy: Numba's per-thread random streams aren't reproducible
+        if _use_fused(n, seed):
+            start_minute = start_time.hour * 60 + start_time.minute
+            voltage, current, temperature = _synth_fused(n, interval_minutes, start_minute)
+        else:
+            # Hour of day (0-24)
+            minute_of_day = (timestamps - timestamps.astype('datetime64[D]')).astype('timedelta64[m]')
+            hour = minute_of_day.astype(np.int64) / 60.0
+            # PCG64 generator; a fixed seed reproduces the same dataset
+            voltage, current, temperature = _synth_numpy(hour, np.random.default_rng(seed))
         
-        # Bulk insert
+        # Bulk load in bounded pages, committing each so long runs hold one page in memory
+        # and keep what they wrote; without COPY, pages go out as a Core executemany of dicts
         print("Inserting records into database...")
-        db.bulk_save_objects(records)
-        db.commit()
+        # psycopg 3 can stream rows with COPY, which skips per-statement parsing entirely
+        use_copy = db.get_bind().dialect.driver == "psycopg"
+        for start in range(0, n, PAGE_SIZE):
+            page = slice(start, start + PAGE_SIZE)
+            rows = zip(voltage[page].tolist(), current[page].tolist(),
+                       temperature[page].tolist(), timestamps[page].tolist())
+            if use_copy:
+                _copy_page(db, panel_id, rows)
+            else:
+                db.execute(insert(Telemetry), [
+                    {'panel_id': panel_id, 'voltage': v, 'current': c, 'temperature': t, 'timestamp': ts}
+                    for v, c, t, ts in rows
+                ])
+            db.commit()
+            print(f"  Inserted {min(start + PAGE_SIZE, n)}/{n} records...")
         
         print(f"\n✓ Successfully generated and saved {total_samples} telemetry records")
-        print(f"  Time range: {records[0].timestamp} to {records[-1].timestamp}")
-        print(f"  Voltage range: {min(r.voltage for r in records):.2f}V - {max(r.voltage for r in records):.2f}V")
-        print(f"  Current range: {min(r.current for r in records):.2f}A - {max(r.current for r in records):.2f}A")
-        print(f"  Temperature range: {min(r.temperature for r in records):.2f}°C - {max(r.temperature for r in records):.2f}°C")
+        print(f"  Time range: {timestamps[0].item()} to {timestamps[-1].item()}")
+        print(f"  Voltage range: {voltage.min():.2f}V - {voltage.max():.2f}V")
+        print(f"  Current range: {current.min():.2f}A - {current.max():.2f}A")
+        print(f"  Temperature range: {temperature.min():.2f}°C - {temperature.max():.2f}°C")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -126,6 +189,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate sample telemetry data")
     parser.add_argument('--days', type=int, default=30, help='Number of days of data to generate')
     parser.add_argument('--samples-per-hour', type=int, default=4, help='Samples per hour')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
     args = parser.parse_args()
     
-    generate_realistic_telemetry(num_days=args.days, samples_per_hour=args.samples_per_hour)
+    generate_realistic_telemetry(num_days=args.days, samples_per_hour=args.samples_per_hour, seed=args.seed)
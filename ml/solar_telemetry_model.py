@@ -9,10 +9,8 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
-from tensorflow.keras import models, layers
 import sys
 
 warnings.filterwarnings("ignore")
@@ -23,83 +21,112 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
 WINDOW_SIZE = 20  # Number of past timesteps to use for prediction
 EPOCHS = 50  # Training epochs
 BATCH_SIZE = 32
+SHUFFLE_BUFFER = 8192  # Training windows shuffled per epoch (covers typical datasets whole)
+LOAD_CHUNK_SIZE = 50_000  # Rows per fetch when reading telemetry from the database
+# Column types for DB reads; each chunk is built straight into float32 columns
+TELEMETRY_DTYPES = {col: np.float32 for col in ('voltage', 'current', 'temperature', 'power')}
 
 scaler = StandardScaler()
 
 
 def load_telemetry_from_db(panel_id=None):
     """Load telemetry data from PostgreSQL database."""
-    from app.db.database import SessionLocal
+    from sqlalchemy import select
+    from app.db.database import engine
     from app.models.telemetry import Telemetry
     
-    db = SessionLocal()
-    try:
-        query = db.query(Telemetry).order_by(Telemetry.timestamp)
-        if panel_id:
-            query = query.filter(Telemetry.panel_id == panel_id)
-        
-        results = query.all()
-        
-        if not results:
-            raise ValueError("No telemetry data found in database. Please add data first.")
-        
-        data = []
-        for record in results:
-            data.append({
-                'timestamp': record.timestamp,
-                'voltage': record.voltage,
-                'current': record.current,
-                'temperature': record.temperature,
-                'power': record.voltage * record.current  # Calculate power
-            })
-        
-        df = pd.DataFrame(data)
-        print(f"Loaded {len(df)} telemetry records from database")
-        return df
-    
-    finally:
-        db.close()
+    # Power is the table's generated voltage * current column
+    stmt = select(
+        Telemetry.timestamp, Telemetry.voltage, Telemetry.current,
+        Telemetry.temperature, Telemetry.power,
+    )
+    # Both orders are a backward scan of ix_telemetry_panel_ts (panel_id, timestamp DESC), so
+    # Postgres walks the index instead of sorting; main() orders all-panel loads by timestamp
+    if panel_id:
+        stmt = stmt.where(Telemetry.panel_id == panel_id).order_by(Telemetry.timestamp)
+    else:
+        stmt = stmt.order_by(Telemetry.panel_id.desc(), Telemetry.timestamp)
+    
+    # Server-side cursor read in chunks straight into typed columns; no ORM objects or dicts
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=LOAD_CHUNK_SIZE) as conn:
+        chunks = list(pd.read_sql(stmt, conn, chunksize=LOAD_CHUNK_SIZE, dtype=TELEMETRY_DTYPES))
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if df.empty:
+        raise ValueError("No telemetry data found in database. Please add data first.")
+    
+    print(f"Loaded {len(df)} telemetry records from database")
+    return df
+
+
+def _windows(data, labels, window_size):
+    """Window i covers rows i..i+window_size-1 and predicts the label right after it."""
+    n = len(data) - window_size
+    if n <= 0:
+        return np.empty((0, window_size, data.shape[1]), dtype=data.dtype), labels[:0]
+    # (n+1, features, window) view over data; one contiguous copy into (n, window, features)
+    windows = np.lib.stride_tricks.sliding_window_view(data, window_size, axis=0)[:n]
+    return np.ascontiguousarray(windows.transpose(0, 2, 1)), labels[window_size:]
 
 
 def create_sequences(df, feature_cols, target_col, window_size=20):
     """Create windowed sequences for LSTM training."""
-    data = scaler.fit_transform(df[feature_cols].to_numpy())
-    labels = df[target_col].to_numpy()
-    
-    X = []
-    y = []
-    
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(labels[i + window_size])
-    
-    return np.array(X), np.array(y)
+    # float32 throughout: Keras computes in float32, and it halves the sequence tensor
+    data = scaler.fit_transform(df[feature_cols].to_numpy(dtype=np.float32))
+    labels = df[target_col].to_numpy(dtype=np.float32)
+    return _windows(data, labels, window_size)
 
 
 def create_sequences_transform(df, feature_cols, target_col, window_size=20):
     """Create windowed sequences using pre-fitted scaler (for validation/test)."""
-    data = scaler.transform(df[feature_cols].to_numpy())
-    labels = df[target_col].to_numpy()
-    
-    X = []
-    y = []
-    
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(labels[i + window_size])
-    
-    return np.array(X), np.array(y)
+    data = scaler.transform(df[feature_cols].to_numpy(dtype=np.float32))
+    labels = df[target_col].to_numpy(dtype=np.float32)
+    return _windows(data, labels, window_size)
+
+
+def save_scalers(target_col):
+    """Save the fitted feature scaling next to the model so the backend doesn't refit it per request."""
+    path = Path(__file__).parent / f"telemetry_{target_col}_scaler.npz"
+    # Targets are trained unscaled, so the target transform is the identity
+    np.savez(path, x_mean=scaler.mean_, x_scale=scaler.scale_,
+             y_mean=np.zeros(1), y_scale=np.ones(1))
+    print(f"Scalers saved to: {path}")
+
+
+def make_dataset(X, y, shuffle=False):
+    """Batched tf.data pipeline over the windows; cached in memory, next batch prefetched during each step."""
+    import tensorflow as tf
+    
+    ds = tf.data.Dataset.from_tensor_slices((X, y)).cache()
+    if shuffle:
+        ds = ds.shuffle(SHUFFLE_BUFFER, reshuffle_each_iteration=True)
+    return ds.batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
+
+
+def enable_mixed_precision():
+    """Compute in float16 (variables stay float32) when a GPU is available; a no-op on CPU."""
+    import tensorflow as tf
+    
+    if not tf.config.list_physical_devices('GPU'):
+        print("No GPU visible, training in float32")
+        return
+    tf.keras.mixed_precision.set_global_policy('mixed_float16')
+    print("Mixed precision enabled (mixed_float16)")
 
 
 def build_model(input_shape, output_units=1):
     """Build LSTM model for time series prediction."""
+    # Imported here so data-only runs (e.g. --save-scalers-only) never load TensorFlow
+    from tensorflow.keras import models, layers
+    
     model = models.Sequential([
         layers.LSTM(64, return_sequences=True, input_shape=input_shape),
         layers.Dropout(0.2),
         layers.LSTM(32, return_sequences=False),
         layers.Dropout(0.2),
         layers.Dense(32, activation='relu'),
-        layers.Dense(output_units, activation='linear')
+        # Kept float32 under mixed precision so the regression output isn't rounded to fp16
+        layers.Dense(output_units, activation='linear', dtype='float32')
     ])
     return model
 
@@ -112,6 +139,12 @@ def main():
                        help='Target variable to predict')
     parser.add_argument('--csv', type=str, default=None, 
                        help='Use CSV file instead of database')
+    parser.add_argument('--save-scalers-only', action='store_true',
+                       help='Fit and save the scalers for an already trained model, skip training')
+    parser.add_argument('--mixed-precision', action='store_true',
+                       help='Train with the mixed_float16 policy when a GPU is available')
+    parser.add_argument('--show', action='store_true',
+                       help='Open the results plot in a window (it is always saved to PNG)')
     args = parser.parse_args()
     
     print("="*60)
@@ -132,7 +165,7 @@ def main():
         df = load_telemetry_from_db(args.panel_id)
     
     # Sort by timestamp
-    df = df.sort_values('timestamp').reset_index(drop=True)
+    df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
     
     # Feature engineering
     feature_cols = ['voltage', 'current', 'temperature']
@@ -141,6 +174,9 @@ def main():
     if target_col not in df.columns:
         raise ValueError(f"Target column '{target_col}' not found in data")
     
+    # One float32 copy of the model columns (CSV and DB both arrive as float64)
+    df = df.astype({col: np.float32 for col in dict.fromkeys(feature_cols + [target_col])})
+    
     print(f"\nData shape: {df.shape}")
     print(f"Features: {feature_cols}")
     print(f"Target: {target_col}")
@@ -163,6 +199,11 @@ def main():
     
     print(f"\nTrain: {len(df_train)} | Val: {len(df_val)} | Test: {len(df_test)}")
     
+    if args.save_scalers_only:
+        scaler.fit(df_train[feature_cols].to_numpy(dtype=np.float32))
+        save_scalers(target_col)
+        return
+    
     # Create sequences
     X_train, y_train = create_sequences(df_train, feature_cols, target_col, WINDOW_SIZE)
     X_val, y_val = create_sequences_transform(df_val, feature_cols, target_col, WINDOW_SIZE)
@@ -170,6 +211,9 @@ def main():
     
     print(f"\nSequence shapes: X_train={X_train.shape}, y_train={y_train.shape}")
     
+    if args.mixed_precision:
+        enable_mixed_precision()
+    
     # Build and compile model
     model = build_model(input_shape=(WINDOW_SIZE, len(feature_cols)))
     model.compile(optimizer='adam', loss='mse', metrics=['mae'])
@@ -180,10 +224,9 @@ def main():
     # Train
     print(f"\nTraining for {EPOCHS} epochs...")
     history = model.fit(
-        X_train, y_train,
-        validation_data=(X_val, y_val),
+        make_dataset(X_train, y_train, shuffle=True),
+        validation_data=make_dataset(X_val, y_val),
         epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
         verbose=1
     )
     
@@ -192,7 +235,7 @@ def main():
     print("EVALUATION RESULTS")
     print("="*60)
     
-    y_pred = model.predict(X_test, verbose=0)
+    y_pred = model.predict(X_test, batch_size=BATCH_SIZE, verbose=0)
     
     mse = mean_squared_error(y_test, y_pred)
     rmse = np.sqrt(mse)
@@ -216,9 +259,15 @@ def main():
     model_path = Path(__file__).parent / f"telemetry_{target_col}_model.h5"
     model.save(model_path)
     print(f"\nModel saved to: {model_path}")
+    save_scalers(target_col)
     
     # Plot results
-    plt.figure(figsize=(15, 5))
+    import matplotlib
+    if not args.show:
+        matplotlib.use('Agg')  # Headless: no GUI backend needed just to save the PNG
+    import matplotlib.pyplot as plt
+    
+    fig = plt.figure(figsize=(15, 5))
     
     # Plot 1: Training history
     plt.subplot(1, 2, 1)
@@ -243,14 +292,17 @@ def main():
     plt.tight_layout()
     plt.savefig(Path(__file__).parent / f'telemetry_{target_col}_results.png')
     print(f"Plot saved to: telemetry_{target_col}_results.png")
-    plt.show()
+    if args.show:
+        plt.show()
+    plt.close(fig)
     
     # Example prediction
     print(f"\n{'='*60}")
     print("EXAMPLE PREDICTION")
     print("="*60)
     last_window = X_test[-1:]
-    next_pred = model.predict(last_window, verbose=0)[0][0]
+    # Direct call for a single window; predict()'s batching machinery only pays off on X_test
+    next_pred = float(model(last_window, training=False)[0, 0])
     print(f"Predicted next {target_col}: {next_pred:.2f}")
     print(f"Actual next {target_col}: {y_test[-1]:.2f}")
     print(f"Error: {abs(next_pred - y_test[-1]):.2f}")